@@ -0,0 +1,86 @@
+"""
+A/B comparison of the two questionnaire answering modes of SimplifedGPT against the real model.
+
+    python -m benchmarks.answer_mode_ab [--profile ./env/backup.yaml] [--questions questions.json] [--repeat 1]
+
+"two_step" routes the question to a profile section and then answers from that section (two calls),
+"fused" does both in one call (ANSWER_MODE=fused). For every question both modes are timed and their
+answers compared; the report gives latency per mode and how often the answers (and sections) agree.
+questions.json: a list of plain questions or {"Question": ..., "options": {"A": ..., "B": ...}} objects.
+"""
+import argparse
+import json
+import statistics
+import time
+from src.utils.simplifed_gpt import SimplifedGPT
+from src.utils.simplified_job_application_profile import load_profile_from_file
+
+SAMPLE_QUESTIONS = [
+    {"Question": "Which of the following statements best describes your right to work in Hong Kong?",
+     "options": {"A": "I'm a Hong Kong permanent resident", "B": "I hold a temporary visa (IANG, QMAS, TPPS)", "C": "I require sponsorship to work for a new employer"}},
+    {"Question": "What's your expected monthly basic salary?",
+     "options": {"A": "HK$20K", "B": "HK$30K", "C": "HK$40K", "D": "HK$50K+"}},
+    {"Question": "How many years' experience do you have as a software engineer?",
+     "options": {"A": "No experience", "B": "Less than 1 year", "C": "1 year", "D": "2 years", "E": "3 years or more"}},
+    {"Question": "Which of the following programming languages are you experienced in?",
+     "options": {"A": "Python", "B": "Java", "C": "C++", "D": "JavaScript", "E": "Go"}},
+    {"Question": "Which of the following languages are you fluent in?",
+     "options": {"A": "English", "B": "Cantonese", "C": "Mandarin"}},
+    {"Question": "How much notice are you required to give your current employer?",
+     "options": {"A": "None, I'm ready to go now", "B": "1 week", "C": "2 weeks", "D": "1 month", "E": "2 months"}},
+]
+
+
+def normalize(answer) -> tuple:
+    return tuple(sorted(str(part).strip().upper() for part in answer if str(part).strip()))
+
+
+def timed(func, question):
+    start = time.perf_counter()
+    result = func(question)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", default="./env/backup.yaml")
+    parser.add_argument("--questions", help="JSON file with the questions to ask, defaults to a built-in sample")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    questions = SAMPLE_QUESTIONS
+    if args.questions:
+        with open(args.questions, "r", encoding="utf-8") as f:
+            questions = json.load(f)
+
+    answerer = SimplifedGPT("")
+    answerer.set_job_application_profile(load_profile_from_file(args.profile))
+
+    latencies = {"two_step": [], "fused": []}
+    answer_agree = section_agree = fused_failures = total = 0
+    for _ in range(args.repeat):
+        for question in questions:
+            (two_step_section, two_step_answer), two_step_s = timed(answerer.route_and_answer, question)
+            fused, fused_s = timed(answerer.fused_answer, question)
+            latencies["two_step"].append(two_step_s)
+            latencies["fused"].append(fused_s)
+            total += 1
+            if fused is None:
+                fused_failures += 1
+                print(f"[fused unparseable] {question}")
+                continue
+            fused_section, fused_answer = fused
+            answer_agree += normalize(two_step_answer) == normalize(fused_answer)
+            section_agree += two_step_section == fused_section
+            print(f"{two_step_s:6.2f}s {fused_s:6.2f}s  two_step={two_step_section}:{two_step_answer}  fused={fused_section}:{fused_answer}")
+
+    print()
+    for mode, values in latencies.items():
+        print(f"{mode:<9} mean {statistics.mean(values):6.2f}s  median {statistics.median(values):6.2f}s  max {max(values):6.2f}s")
+    print(f"answer agreement  {answer_agree}/{total} ({answer_agree / total * 100:.0f}%)")
+    print(f"section agreement {section_agree}/{total} ({section_agree / total * 100:.0f}%)")
+    print(f"fused replies not parseable: {fused_failures}")
+
+
+if __name__ == "__main__":
+    main()
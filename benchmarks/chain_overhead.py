@@ -0,0 +1,62 @@
+"""
+Per-question overhead of building prompt chains, measured against a fake LLM so only local work is timed.
+
+    python -m benchmarks.chain_overhead [--questions 200]
+
+"rebuild" is the old standard_simplified_profile_chain: seven section chains plus the routing chain
+compiled for every question. "registry" takes the same chains from a ChainRegistry compiled once.
+Both paths make the same two (fake) LLM calls per question.
+"""
+import argparse
+import time
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+import src.utils.strings as strings
+from src.utils.chain_registry import ChainRegistry, strings_templates
+from src.utils.simplifed_gpt import SECTION_PROMPT, SECTION_TEMPLATES
+
+QUESTION = "How many years of Python experience do you have?"
+
+
+def rebuild_per_question(llm):
+    def create_chain(template):
+        return ChatPromptTemplate.from_template(template) | llm | StrOutputParser()
+
+    chains = {section: create_chain(getattr(strings, name)) for section, name in SECTION_TEMPLATES.items()}
+    section_name = create_chain(SECTION_PROMPT).invoke({"question": QUESTION}).lower().replace(" ", "_")
+    return chains[section_name].invoke({"resume_section": "Python: 5 years", "question": QUESTION})
+
+
+def from_registry(registry):
+    section_name = registry["section_router"].invoke({"question": QUESTION}).lower().replace(" ", "_")
+    return registry[SECTION_TEMPLATES[section_name]].invoke({"resume_section": "Python: 5 years", "question": QUESTION})
+
+
+def timed(label, func, questions):
+    start = time.perf_counter()
+    for _ in range(questions):
+        func()
+    per_question_ms = (time.perf_counter() - start) * 1000 / questions
+    print(f"{label:<10} {per_question_ms:8.3f} ms/question")
+    return per_question_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=200)
+    args = parser.parse_args()
+
+    llm = FakeListChatModel(responses=["Develop Role", "5"])  # cycles: route, then answer
+
+    start = time.perf_counter()
+    registry = ChainRegistry(llm, {**strings_templates(), "section_router": SECTION_PROMPT})
+    print(f"registry   {(time.perf_counter() - start) * 1000:8.3f} ms one-off compile")
+
+    rebuild_ms = timed("rebuild", lambda: rebuild_per_question(llm), args.questions)
+    registry_ms = timed("registry", lambda: from_registry(registry), args.questions)
+    print(f"saved      {rebuild_ms - registry_ms:8.3f} ms/question ({(1 - registry_ms / rebuild_ms) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
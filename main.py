@@ -10,6 +10,8 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.common.exceptions import WebDriverException, TimeoutException
 from lib_resume_builder_AIHawk import Resume, StyleManager, FacadeManager, ResumeGenerator 
 from src.utils.utils import chromeBrowserOptions
+from src.base.base_job_manager import EnvironmentKeys
+from src.logging.webdriver_profiler import WebDriverProfiler
 from src.utils.gpt import GPTAnswerer
 from src.linkedin.linkedIn_authenticator import LinkedInAuthenticator
 from src.linkedin.linkedIn_bot_facade import LinkedInBotFacade
@@ -99,6 +101,18 @@ class ConfigValidator:
             if parameters[blacklist] is None:
                 parameters[blacklist] = []
 
+        # Optional JobsDB-only search filters
+        jobsdb = parameters.get('jobsdb') or {}
+        if not isinstance(jobsdb, dict):
+            raise ConfigError(f"'jobsdb' must be a mapping in config file {config_yaml_path}")
+        for key in ['salaryMin', 'salaryMax', 'classification']:
+            if key in jobsdb and not isinstance(jobsdb[key], int):
+                raise ConfigError(f"'jobsdb.{key}' must be an integer in config file {config_yaml_path}")
+        work_arrangements = ['on-site', 'hybrid', 'remote']
+        if not all(arrangement in work_arrangements for arrangement in jobsdb.get('workArrangement', [])):
+            raise ConfigError(f"'jobsdb.workArrangement' must only contain {work_arrangements} in config file {config_yaml_path}")
+        parameters['jobsdb'] = jobsdb
+
         return parameters
 
 
@@ -180,12 +194,14 @@ def create_and_run_bot(email: str, password: str, parameters: dict, openai_api_k
             with open(r"./env/backup.yaml", "r", encoding='utf-8') as file:
                 plain_text_resume = file.read()
             job_application_profile_object = SimplifiedJobApplicationProfile(plain_text_resume)
-            gpt_answerer_component = SimplifedGPT(openai_api_key)
+            gpt_answerer_component = SimplifedGPT(openai_api_key, answer_mode=EnvironmentKeys().answer_mode,
+                                                  description_token_budget=EnvironmentKeys().description_token_budget)
         else:
             job_application_profile_object = JobApplicationProfile(plain_text_resume)
-            gpt_answerer_component = GPTAnswerer(openai_api_key)
+            gpt_answerer_component = GPTAnswerer(openai_api_key, answer_mode=EnvironmentKeys().answer_mode)
 
         browser = init_browser()
+        profiler = WebDriverProfiler(browser).install() if EnvironmentKeys().profile_webdriver else None
         
         # Create platform-specific components
         if platform.lower() == "jobsdb":
@@ -203,8 +219,12 @@ def create_and_run_bot(email: str, password: str, parameters: dict, openai_api_k
         bot.set_job_application_profile_and_resume(job_application_profile_object, resume_object)
         bot.set_gpt_answerer_and_resume_generator(gpt_answerer_component, resume_generator_manager)
         bot.set_parameters(parameters)
-        bot.start_login()
-        bot.start_apply()
+        try:
+            bot.start_login()
+            bot.start_apply()
+        finally:
+            if profiler is not None:
+                profiler.write_run_report()
     except WebDriverException as e:
         print(f"WebDriver error occurred: {e}")
     except Exception as e:
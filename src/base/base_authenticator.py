@@ -1,10 +1,13 @@
 import time
 import random
 from abc import ABC, abstractmethod
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from src.base.session_store import SessionStore
 
 
 class BaseAuthenticator(ABC):
@@ -20,6 +23,8 @@ class BaseAuthenticator(ABC):
         self.base_url = ""
         self.login_url = ""
         self.feed_url = ""
+        self.session_store = None
+        self.login_metrics = []
 
     def set_secrets(self, email, password):
         """Set authentication credentials"""
@@ -47,29 +52,96 @@ class BaseAuthenticator(ABC):
         self.base_url, self.login_url, self.feed_url = urls
         
         print(f"Starting Chrome browser to log in to {self.base_url}")
+        restored = self.restore_session()
         self.driver.get(self.base_url)
         self.wait_for_page_load()
         
-        if not self.is_logged_in():
-            self.handle_login()
+        if self.is_logged_in():
+            if not restored:
+                self.session_store.save(self.driver)
+            return
+        
+        self.discard_session(restored)
+        self.handle_login()
+        if self.is_logged_in():
+            self.session_store.save(self.driver)
+
+    def restore_session(self) -> bool:
+        """Restore a stored session into the driver before the first navigation"""
+        self.session_store = SessionStore(urlparse(self.base_url).netloc, f"{self.email}:{self.password}", self.base_url)
+        return self.session_store.restore(self.driver)
 
+    def discard_session(self, restored: bool) -> None:
+        """Drop a restored session that turned out not to be logged in, from the store and from the driver"""
+        if restored:
+            print("Stored session is no longer valid, falling back to interactive login.")
+            self.session_store.clear()
+            self.driver.delete_all_cookies()
+
+    @abstractmethod
     def handle_login(self):
-        """Handle the login process"""
-        print(f"Navigating to the login page...")
-        self.driver.get(self.login_url)
-        
-        if self.feed_url.split('/')[-1] in self.driver.current_url:
-            print("User is already logged in.")
-            return
-            
+        """Log in interactively; platforms wait on wait_for_login_outcome(get_login_outcomes()) instead of sleeping"""
+        pass
+
+    def get_login_outcomes(self) -> Dict[str, Dict]:
+        """
+        Observable results of submitting the login form, checked in order, so success wins over a stray error.
+        Each outcome is matched by URL fragments ('url_contains') and/or a CSS 'selector';
+        with 'visible_text' the selector only counts when a matched element is displayed and has text
+        (pages often keep an empty aria-live alert region in the DOM).
+        'timeout' is how many seconds after submitting the outcome may still appear.
+        Platforms override this with their own selectors.
+        """
+        return {
+            'feed': {'url_contains': [self.feed_url], 'timeout': 40},
+            'verification_code': {'selector': 'input[name="code"], input[autocomplete="one-time-code"]', 'timeout': 40},
+            'security_challenge': {'url_contains': ['checkpoint', 'challenge', 'captcha'], 'timeout': 40},
+            'error': {'selector': '[role="alert"], .alert-error, .form-error', 'visible_text': True, 'timeout': 15},
+        }
+
+    @staticmethod
+    def _shows_text(element) -> bool:
         try:
-            self.enter_credentials()
-            self.submit_login_form()
-        except NoSuchElementException:
-            print("Could not log in. Please check your credentials.")
-        
-        time.sleep(random.uniform(30, 40))  # Human-like delay
-        self.handle_security_check()
+            return element.is_displayed() and bool(element.text.strip())
+        except StaleElementReferenceException:
+            return False
+
+    def wait_for_login_outcome(self, outcomes: Dict[str, Dict]) -> Optional[str]:
+        """
+        Return the first login outcome observed, as soon as it is observed, or None once every
+        outcome's timeout has passed. URL matches are ignored while still on the login page.
+        The time to each outcome is recorded in self.login_metrics.
+        """
+        started = time.perf_counter()
+        observed = {}
+
+        def detect(driver):
+            elapsed = time.perf_counter() - started
+            current_url = driver.current_url
+            on_login_page = bool(self.login_url) and current_url.startswith(self.login_url)
+            for name, spec in outcomes.items():
+                if elapsed > spec.get('timeout', 40):
+                    continue
+                url_match = not on_login_page and any(fragment and fragment in current_url for fragment in spec.get('url_contains', []))
+                elements = driver.find_elements(By.CSS_SELECTOR, spec['selector']) if spec.get('selector') else []
+                if spec.get('visible_text'):
+                    elements = [element for element in elements if self._shows_text(element)]
+                if url_match or elements:
+                    observed['name'] = name
+                    return True
+            return False
+
+        longest = max((spec.get('timeout', 40) for spec in outcomes.values()), default=0)
+        try:
+            WebDriverWait(self.driver, longest, poll_frequency=0.5).until(detect)
+        except TimeoutException:
+            pass
+
+        outcome = observed.get('name')
+        elapsed = time.perf_counter() - started
+        self.login_metrics.append({'outcome': outcome or 'timeout', 'seconds': round(elapsed, 2)})
+        print(f"Login outcome: {outcome or 'none observed'} after {elapsed:.1f}s")
+        return outcome
 
     def enter_credentials(self):
         """Enter username and password using platform-specific selectors"""
@@ -17,6 +17,13 @@ class EnvironmentKeys:
     def __init__(self):
         self.skip_apply = self._read_env_key_bool("SKIP_APPLY")
         self.disable_description_filter = self._read_env_key_bool("DISABLE_DESCRIPTION_FILTER")
+        self.verify_prefilled_answers = self._read_env_key_bool("VERIFY_PREFILLED_ANSWERS")
+        self.profile_webdriver = self._read_env_key_bool("PROFILE_WEBDRIVER")
+        self.answer_mode = self._read_env_key("ANSWER_MODE") or "two_step"
+        self.batch_form_answers = self._read_env_key_bool("BATCH_FORM_ANSWERS")
+        self.concurrent_form_answers = self._read_env_key_bool("CONCURRENT_FORM_ANSWERS")
+        self.description_token_budget = int(self._read_env_key("DESCRIPTION_TOKEN_BUDGET") or 800)
+        self.lookahead_depth = int(self._read_env_key("LOOKAHEAD_DEPTH") or 3)
 
     @staticmethod
     def _read_env_key(key: str) -> str:
@@ -90,17 +97,23 @@ class BaseJobManager(ABC):
         """Set resume generator manager"""
         self.resume_generator_manager = resume_generator_manager  # Can be None if disabled
 
+    @staticmethod
+    def title_or_company_blacklisted(job_title: str, company: str, title_blacklist: list, company_blacklist: list) -> bool:
+        """A word of the title is blacklisted, or the company equals a blacklisted name"""
+        job_title_words = job_title.lower().split(' ')
+        title_blacklisted = any(word in job_title_words for word in title_blacklist)
+        company_blacklisted = company.strip().lower() in (word.strip().lower() for word in company_blacklist)
+        return title_blacklisted or company_blacklisted
+
     def is_blacklisted(self, job_title: str, company: str, link: str) -> bool:
         """Check if job should be skipped based on blacklists"""
-        job_title_words = job_title.lower().split(' ')
-        title_blacklisted = any(word in job_title_words for word in self.title_blacklist)
-        company_blacklisted = company.strip().lower() in (word.strip().lower() for word in self.company_blacklist)
+        blacklisted = self.title_or_company_blacklisted(job_title, company, self.title_blacklist, self.company_blacklist)
         link_seen = link in self.seen_jobs
         
         if not link_seen:
             self.seen_jobs.append(link)
             
-        return title_blacklisted or company_blacklisted or link_seen
+        return blacklisted or link_seen
 
     def start_applying(self):
         """Start the job application process"""
@@ -0,0 +1,139 @@
+import base64
+import hashlib
+import json
+import os
+import time
+from typing import Optional
+from cryptography.fernet import Fernet, InvalidToken
+
+SESSION_DIR = r"./env/sessions"
+
+# Written into every new document before page scripts run, so restored localStorage is in place
+# for the site's own login check without an extra navigation.
+_LOCAL_STORAGE_SCRIPT = """
+(function () {
+    if (window.location.origin !== %s) { return; }
+    const items = %s;
+    for (const key in items) {
+        if (window.localStorage.getItem(key) === null) { window.localStorage.setItem(key, items[key]); }
+    }
+})();
+"""
+
+
+class SessionStore:
+    """
+    Encrypted-at-rest snapshot of a logged-in browser session (cookies and localStorage) for one platform.
+
+    The key is derived from the account credentials (PBKDF2 + random salt), so the file is useless
+    without the secrets.yaml it was created with. A snapshot is restored into a fresh driver through
+    CDP before the first navigation; expiry is validated locally from the stored cookie timestamps,
+    so a dead session is discarded without touching the network.
+    """
+
+    def __init__(self, platform: str, secret: str, origin: str, store_dir: str = SESSION_DIR, max_age_days: int = 14):
+        self.platform = platform
+        self.secret = secret
+        self.origin = origin.rstrip('/')
+        self.path = os.path.join(store_dir, f"{platform}.session")
+        self.max_age_seconds = max_age_days * 24 * 3600
+
+    def _fernet(self, salt: bytes) -> Fernet:
+        key = hashlib.pbkdf2_hmac("sha256", self.secret.encode("utf-8"), salt, 200_000)
+        return Fernet(base64.urlsafe_b64encode(key))
+
+    def save(self, driver) -> None:
+        """Export cookies and localStorage of the current (logged-in) page"""
+        try:
+            session = {
+                "saved_at": time.time(),
+                "origin": self.origin,
+                "cookies": driver.get_cookies(),
+                "local_storage": driver.execute_script("return Object.assign({}, window.localStorage);") or {},
+            }
+            salt = os.urandom(16)
+            token = self._fernet(salt).encrypt(json.dumps(session).encode("utf-8"))
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"salt": base64.b64encode(salt).decode("ascii"), "token": token.decode("ascii")}, f)
+            os.replace(temp_path, self.path)  # atomic, parallel sessions never read a half-written file
+            print(f"Session saved for {self.platform} ({len(session['cookies'])} cookies).")
+        except Exception as e:
+            print(f"Could not save session for {self.platform}: {e}")
+
+    def load(self) -> Optional[dict]:
+        """Return the stored session if it decrypts and has not expired, None otherwise"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            salt = base64.b64decode(stored["salt"])
+            session = json.loads(self._fernet(salt).decrypt(stored["token"].encode("ascii")))
+        except FileNotFoundError:
+            return None
+        except (InvalidToken, KeyError, ValueError) as e:
+            print(f"Stored session for {self.platform} is unreadable, ignoring it: {type(e).__name__} {e}")
+            return None
+
+        now = time.time()
+        if now - session.get("saved_at", 0) > self.max_age_seconds:
+            print(f"Stored session for {self.platform} is too old.")
+            return None
+        cookies = [cookie for cookie in session.get("cookies", []) if cookie.get("expiry", now + 1) > now]
+        if not cookies:
+            print(f"Stored session for {self.platform} has expired.")
+            return None
+        session["cookies"] = cookies
+        return session
+
+    def restore(self, driver) -> bool:
+        """Load the stored session into the driver before the first navigation. Returns True if restored."""
+        session = self.load()
+        if session is None:
+            return False
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": [self._to_cdp_cookie(cookie) for cookie in session["cookies"]]})
+            if session.get("local_storage"):
+                driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+                    "source": _LOCAL_STORAGE_SCRIPT % (json.dumps(self.origin), json.dumps(session["local_storage"]))
+                })
+        except AttributeError:
+            # Not a Chromium driver: cookies can only be added on a page of their domain
+            driver.get(self.origin)
+            for cookie in session["cookies"]:
+                try:
+                    driver.add_cookie(cookie)
+                except Exception:
+                    continue
+            driver.execute_script(
+                "const items = arguments[0]; for (const key in items) { window.localStorage.setItem(key, items[key]); }",
+                session.get("local_storage", {}),
+            )
+        except Exception as e:
+            print(f"Could not restore session for {self.platform}: {e}")
+            return False
+        print(f"Restored stored session for {self.platform} ({len(session['cookies'])} cookies).")
+        return True
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _to_cdp_cookie(cookie: dict) -> dict:
+        cdp_cookie = {
+            "name": cookie["name"],
+            "value": cookie["value"],
+            "domain": cookie.get("domain"),
+            "path": cookie.get("path", "/"),
+            "secure": cookie.get("secure", False),
+            "httpOnly": cookie.get("httpOnly", False),
+        }
+        if "expiry" in cookie:
+            cdp_cookie["expires"] = cookie["expiry"]
+        if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+            cdp_cookie["sameSite"] = cookie["sameSite"]
+        return cdp_cookie
@@ -0,0 +1,105 @@
+import json
+import os
+import re
+from datetime import datetime, timedelta
+from typing import Optional
+
+PROGRESS_PATH = "job_apply_logs/apply_progress.json"
+# an unfinished application is given up after this many attempts, and forgotten after this many days
+MAX_APPLY_ATTEMPTS = 3
+PROGRESS_MAX_AGE_DAYS = 7
+
+# JobsDB apply pages in the order they are normally shown; questions and profile are optional
+APPLY_STEPS = ["documents", "questions", "profile", "review", "confirmation"]
+
+# Matched against the apply tab URL (https://hk.jobsdb.com/job/<id>/apply/<page>)
+STEP_URL_PATTERNS = {
+    "confirmation": re.compile(r"/apply/(success|confirmation)"),
+    "review": re.compile(r"/apply/review"),
+    "profile": re.compile(r"/apply/profile"),
+    "questions": re.compile(r"/apply/role-requirement"),
+    "documents": re.compile(r"/apply(/(choose-)?documents)?/?(\?|#|$)"),
+}
+
+
+def detect_apply_step(url: str) -> Optional[str]:
+    """Return the apply step the URL belongs to, None when the page is not recognised"""
+    for step, pattern in STEP_URL_PATTERNS.items():
+        if pattern.search(url or ""):
+            return step
+    return None
+
+
+class ApplyProgress:
+    """
+    Persisted progress of JobsDB applications, so a retried or re-run application skips the
+    steps and the expensive work (LLM job parsing, cover letter generation) already done.
+
+    Stored structure: {
+        "<job_id>": {
+            "completed_steps": ["documents", "questions"],
+            "job_info": {...parsed job info...},
+            "resume_path": "...", "cover_letter_path": "...",
+            "attempts": 1, "updated_at": "2024-01-01 10:00:00"
+        }
+    }
+    "submitting" in completed_steps means submit was clicked without a confirmed outcome; such an entry is
+    kept (needs_manual_check) until JobsDB shows the job as applied.
+    An entry is dropped once the application reaches the confirmation page. Entries not updated for
+    PROGRESS_MAX_AGE_DAYS are dropped on load, and exhausted() tells when MAX_APPLY_ATTEMPTS were spent.
+    """
+
+    def __init__(self, progress_path: str = PROGRESS_PATH):
+        self.progress_path = progress_path
+        self.records = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.progress_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        cutoff = (datetime.now() - timedelta(days=PROGRESS_MAX_AGE_DAYS)).strftime("%Y-%m-%d %H:%M:%S")
+        return {job_id: entry for job_id, entry in data.items()
+                if isinstance(entry, dict) and entry.get("updated_at", "") >= cutoff}
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.progress_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.progress_path, "w", encoding="utf-8") as f:
+            json.dump(self.records, f, ensure_ascii=False, indent=2, default=str)
+
+    def get(self, job_id: str) -> dict:
+        return self.records.setdefault(job_id, {"completed_steps": [], "attempts": 0})
+
+    def start_attempt(self, job_id: str) -> dict:
+        entry = self.get(job_id)
+        entry["attempts"] = entry.get("attempts", 0) + 1
+        self._touch(entry)
+        return entry
+
+    @staticmethod
+    def exhausted(entry: dict) -> bool:
+        return entry.get("attempts", 0) > MAX_APPLY_ATTEMPTS
+
+    def update(self, job_id: str, **fields) -> None:
+        entry = self.get(job_id)
+        entry.update(fields)
+        self._touch(entry)
+
+    def complete_step(self, job_id: str, step: str) -> None:
+        entry = self.get(job_id)
+        if step not in entry["completed_steps"]:
+            entry["completed_steps"].append(step)
+        self._touch(entry)
+
+    def finish(self, job_id: str) -> None:
+        self.records.pop(job_id, None)
+        self._save()
+
+    def _touch(self, entry: dict) -> None:
+        entry["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self._save()
@@ -0,0 +1,74 @@
+import re
+from typing import Optional
+from selenium.webdriver.remote.webelement import WebElement
+from src.base.base_job_manager import BaseJobManager
+from src.utils.simplifed_gpt import COMPANY_BLACKLIST, JOB_TITLE_BLACKLIST
+
+# Everything the rules need from a job card, read in one round trip without clicking it
+CARD_HARVEST_SCRIPT = """
+const card = arguments[0];
+const text = selector => {
+    const el = card.querySelector(selector);
+    return el ? el.innerText.trim() : "";
+};
+const badges = Array.from(card.querySelectorAll("span, div, a"))
+    .filter(el => el.children.length === 0)
+    .map(el => el.innerText.trim().toLowerCase());
+return {
+    title: text("[data-automation='jobTitle']"),
+    company: text("[data-automation='jobCompany']"),
+    listed: text("[data-automation='jobListingDate']"),
+    quick_apply: badges.includes("quick apply") || card.querySelector("[data-automation*='quick-apply' i], [data-automation*='quickApply' i]") !== null,
+    external_apply: card.querySelector("[data-automation*='external' i]") !== null,
+};
+"""
+
+_AGE_PATTERN = re.compile(r"(\d+)\s*([mhd])\+?\s*ago", re.IGNORECASE)
+_AGE_UNIT_DAYS = {"m": 1 / 1440, "h": 1 / 24, "d": 1}
+
+
+def listing_age_days(listed: str) -> Optional[float]:
+    """'2d ago' -> 2, '5h ago' -> 0.2, '30d+ ago' -> 30; None when the text is not an age"""
+    match = _AGE_PATTERN.search(listed or "")
+    if not match:
+        return None
+    return int(match.group(1)) * _AGE_UNIT_DAYS[match.group(2).lower()]
+
+
+class CardPreFilter:
+    """
+    Rules that run on the data shown on a JobsDB search card, before the card is clicked and its
+    sidebar loaded. Blacklists are checked by BaseJobManager.title_or_company_blacklisted (the
+    check behind is_blacklisted, without its seen-link bookkeeping), plus phrase matching of
+    multi-word title entries, which a word-by-word comparison can never match.
+    """
+
+    def __init__(self, max_age_days: Optional[float] = None, title_blacklist: list = None, company_blacklist: list = None):
+        self.max_age_days = max_age_days
+        self.title_blacklist = [word.strip().lower() for word in (title_blacklist if title_blacklist is not None else JOB_TITLE_BLACKLIST)]
+        self.company_blacklist = [word.strip().lower() for word in (company_blacklist if company_blacklist is not None else COMPANY_BLACKLIST)]
+
+    def harvest(self, driver, card: WebElement) -> dict:
+        try:
+            return driver.execute_script(CARD_HARVEST_SCRIPT, card) or {}
+        except Exception:
+            return {}
+
+    def reject_reason(self, card_data: dict) -> Optional[str]:
+        """Return why the card can be skipped without opening it, None when it is worth a look"""
+        title = card_data.get("title", "")
+        company = card_data.get("company", "")
+
+        phrase = next((word for word in self.title_blacklist if ' ' in word and word in title.lower()), None)
+        if phrase:
+            return f"title blacklisted ({phrase})"
+        if BaseJobManager.title_or_company_blacklisted(title, company, self.title_blacklist, self.company_blacklist):
+            return f"title or company blacklisted ({title} / {company})"
+
+        age = listing_age_days(card_data.get("listed", ""))
+        if self.max_age_days is not None and age is not None and age > self.max_age_days:
+            return f"listed {card_data['listed']}, older than {self.max_age_days} days"
+
+        if card_data.get("external_apply") and not card_data.get("quick_apply"):
+            return "external apply"
+        return None
@@ -0,0 +1,64 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Optional
+
+REGISTRY_PATH = r"./env/jobsdb_document_registry.json"
+
+
+class DocumentRegistry:
+    """
+    Records which documents JobsDB already has on file, keyed by the SHA-256 of the file content.
+    A resume whose content hash is registered can be picked from the saved documents
+    instead of being uploaded again.
+
+    Stored structure: {
+        "<sha256>": {"kind": "resume", "file_name": "Qi Shihao.pdf", "uploaded_at": "2024-01-01 10:00:00"}
+    }
+    """
+
+    def __init__(self, registry_path: str = REGISTRY_PATH):
+        self.registry_path = registry_path
+        self.records = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.registry_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.registry_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.registry_path, "w", encoding="utf-8") as f:
+            json.dump(self.records, f, ensure_ascii=False, indent=4)
+
+    @staticmethod
+    def content_hash(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def lookup(self, kind: str, path: str) -> Optional[dict]:
+        """Return the registry entry when this exact file content was uploaded before"""
+        if not path or not os.path.exists(path):
+            return None
+        entry = self.records.get(self.content_hash(path))
+        if entry and entry.get("kind") == kind:
+            return entry
+        return None
+
+    def record(self, kind: str, path: str) -> None:
+        """Remember that JobsDB now has this document on file"""
+        self.records[self.content_hash(path)] = {
+            "kind": kind,
+            "file_name": os.path.basename(path),
+            "uploaded_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self._save()
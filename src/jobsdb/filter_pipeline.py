@@ -0,0 +1,87 @@
+import glob
+import json
+import os
+import re
+from collections import Counter
+from typing import Callable, List, Optional, Tuple
+import src.utils.utils as utils
+
+_SALARY_NUMBER = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*([kK])?")
+
+
+def salary_upper_bound(salary: str) -> Optional[float]:
+    """'$30,000 – $40,000 per month' -> 40000, 'HK$25k - 30k' -> 30000; None when no amount is shown"""
+    amounts = []
+    for number, thousand in _SALARY_NUMBER.findall(salary or ""):
+        value = float(number.replace(",", ""))
+        amounts.append(value * 1000 if thousand else value)
+    return max(amounts) if amounts else None
+
+
+def load_applied_job_ids(log_path: str) -> set:
+    """Job ids recorded as applied in the daily job_apply_logs/<date>_log.json files"""
+    applied = set()
+    for path in glob.glob(os.path.join(log_path, "*_log.json")):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                records = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        for record in records if isinstance(records, list) else []:
+            if isinstance(record, dict) and record.get("applied") and record.get("job_id"):
+                applied.add(str(record["job_id"]))
+    return applied
+
+
+class FilterStage:
+    """
+    One decision about a job. check returns the reject reason, or None to let the job through.
+    cost is a relative price (0 = in-memory check, 100 = paid LLM call); cheaper stages run first.
+    """
+
+    def __init__(self, name: str, cost: int, check: Callable[[dict], Optional[str]]):
+        self.name = name
+        self.cost = cost
+        self.check = check
+
+
+class FilterPipeline:
+    """Runs the stages cheapest first and stops at the first reject, counting rejects per stage"""
+
+    def __init__(self, stages: List[FilterStage] = None):
+        self.stages: List[FilterStage] = []
+        self.reject_counts = Counter()
+        self.evaluated = 0
+        for stage in stages or []:
+            self.add_stage(stage)
+
+    def add_stage(self, stage: FilterStage) -> None:
+        self.stages.append(stage)
+        self.stages.sort(key=lambda s: s.cost)  # stable, so equal costs keep their insertion order
+
+    def run(self, job_info: dict) -> Tuple[bool, Optional[str], Optional[str]]:
+        """Return (passed, rejecting stage, reason)"""
+        self.evaluated += 1
+        for stage in self.stages:
+            reason = stage.check(job_info)
+            if reason:
+                self.reject_counts[stage.name] += 1
+                return False, stage.name, reason
+        return True, None, None
+
+    def precheck(self, job_info: dict, below_cost: int = 100) -> Optional[str]:
+        """Reject reason from the stages cheaper than below_cost, without counting it in the report"""
+        for stage in self.stages:
+            if stage.cost >= below_cost:
+                break
+            reason = stage.check(job_info)
+            if reason:
+                return reason
+        return None
+
+    def report(self) -> str:
+        passed = self.evaluated - sum(self.reject_counts.values())
+        per_stage = ", ".join(f"{stage.name}(cost {stage.cost}): {self.reject_counts[stage.name]}" for stage in self.stages)
+        summary = f"Filter pipeline: {self.evaluated} jobs evaluated, {passed} passed; rejects per stage - {per_stage}"
+        utils.printyellow(summary)
+        return summary
@@ -0,0 +1,72 @@
+from typing import Optional
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from src.jobsdb.apply_flow import detect_apply_step
+
+# One round trip: which apply page signatures are present in the DOM right now
+APPLY_PAGE_SIGNATURE_SCRIPT = """
+const has = selector => document.querySelector(selector) !== null;
+const heading = Array.from(document.querySelectorAll("h1, h2, h3")).map(el => el.innerText.toLowerCase()).join(" | ");
+return {
+    ready: document.readyState === "complete",
+    confirmation: /application (was|has been) (sent|submitted)|successfully applied/.test(heading),
+    review: has("button[data-testid='review-submit-application']"),
+    documents: has("[id^='resume-method-'], [id^='coverLetter-method-']"),
+    questions: has("form fieldset[role='radiogroup'], form label[for^='question-'], input[name^='questionnaire.']"),
+    profile: /profile/.test(heading) && has("button[data-testid='continue-button']"),
+};
+"""
+
+# JobsDB's apply tab for a job that already went through: a success heading or an "already applied" notice
+APPLIED_STATE_SCRIPT = """
+const text = (document.body ? document.body.innerText : "").toLowerCase();
+return /application (was|has been) (sent|submitted)|successfully applied|you(?:'ve| have)? (?:already )?applied|already applied/.test(text);
+"""
+
+# Without a URL step, DOM signatures are checked from the last page of the flow to the first
+_SIGNATURE_ORDER = ["confirmation", "review", "documents", "questions", "profile"]
+
+
+def classify_apply_page(driver: webdriver, timeout: float = 15, poll: float = 0.25) -> Optional[str]:
+    """
+    Tell which JobsDB apply step the current tab shows: documents, questions, profile, review or confirmation.
+
+    Polls the URL plus a single DOM signature query until the page can be classified, so the flow
+    proceeds as soon as the page is there instead of sleeping a fixed time. When the URL names a step,
+    the DOM has to agree: after an SPA route change the previous step's DOM can still be mounted, so a
+    signature of another step keeps the poll waiting until it is gone. A page showing no signature at
+    all is trusted to the URL once loaded. Only an unrecognised URL is classified from the DOM alone.
+    Returns None on timeout.
+    """
+    def classify(d):
+        try:
+            signals = d.execute_script(APPLY_PAGE_SIGNATURE_SCRIPT) or {}
+        except Exception:
+            return False
+        present = [step for step in _SIGNATURE_ORDER if signals.get(step)]
+        url_step = detect_apply_step(d.current_url)
+        if url_step:
+            if url_step in present or (not present and signals.get("ready")):
+                return url_step
+            return False
+        return present[0] if present else False
+
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=poll).until(classify)
+    except TimeoutException:
+        return None
+
+
+def shows_applied_state(driver: webdriver, timeout: float = 10, poll: float = 0.5) -> bool:
+    """True when the tab shows that JobsDB has this application on record (confirmation or "already applied")"""
+    def applied(d):
+        try:
+            return bool(d.execute_script(APPLIED_STATE_SCRIPT))
+        except Exception:
+            return False
+
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=poll).until(applied)
+    except TimeoutException:
+        return False
@@ -7,6 +7,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.remote.webdriver import WebDriver
 from src.base.base_authenticator import BaseAuthenticator
+from src.utils.interstitials import InterstitialHandler
 from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException, ElementNotInteractableException
 
 
@@ -26,6 +27,7 @@ class JobsDBAuthenticator(BaseAuthenticator):
     
     def __init__(self, driver: Optional[WebDriver] = None) -> None:
         super().__init__(driver)
+        self.interstitials = InterstitialHandler(self.driver)
 
     def get_platform_urls(self) -> Tuple[str, str, str]:
         """Return JobsDB-specific URLs"""
@@ -44,18 +46,62 @@ class JobsDBAuthenticator(BaseAuthenticator):
             'verify_button': 'button[type="submit"], .verify-button, button:contains("Verify"), button:contains("Sign in")'
         }
 
+    def get_login_outcomes(self) -> Dict[str, Dict]:
+        """Return JobsDB outcomes of requesting an email sign in code"""
+        return {
+            'feed': {'selector': self.get_logged_in_indicator()['selector'], 'timeout': 15},
+            'verification_code': {'selector': 'input[name="code"], input[autocomplete="one-time-code"], input[inputmode="numeric"], #verification-code', 'timeout': 15},
+            'security_challenge': {'url_contains': ['captcha', 'challenge'], 'timeout': 15},
+            'error': {'selector': '[role="alert"], [data-automation*="error"]', 'visible_text': True, 'timeout': 10},
+        }
+
     def get_logged_in_indicator(self) -> Dict[str, str]:
         """Return JobsDB-specific logged in indicator"""
         return {
-            'selector': '[data-automation="member-menu"], .profile-menu, a[href*="/member/"], a[href*="/profile/"]',
+            # menus rendered only for a signed-in member; plain profile links also appear on logged-out pages
+            'selector': '[data-automation="member-menu"], .profile-menu',
             'text': 'My Profile'
         }
 
+    def probe_login_state(self, trust_auth_cookie: bool = False) -> Optional[bool]:
+        """
+        Check login state on the current page without navigating.
+        Returns True/False when the page or cookies tell us, None when undecided.
+        Costs at most three WebDriver commands, so it is safe inside wait predicates.
+        trust_auth_cookie is only for the wait right after a login, when the cookie was just issued;
+        a restored session brings its own copy of the cookie, so there only the rendered page counts.
+        """
+        try:
+            current_url = self.driver.current_url
+            if '/oauth/login' in current_url or '/login' in current_url:
+                return False
+
+            indicator = self.get_logged_in_indicator()
+            if self.driver.find_elements(By.CSS_SELECTOR, indicator['selector']):
+                return True
+
+            if not trust_auth_cookie:
+                return None
+
+            # JobsDB signs in through Auth0, which sets "auth0.<client id>.is.authenticated=true"
+            for cookie in self.driver.get_cookies():
+                if cookie.get('name', '').endswith('.is.authenticated') and cookie.get('value') == 'true':
+                    return True
+        except Exception as e:
+            print(f"⚠️ 登录状态探测异常: {str(e)}")
+        return None
+
     def is_logged_in(self) -> bool:
         """
         Check if user is currently logged in to JobsDB
-        Strategy 1: Direct page access verification (similar to LinkedIn approach)
+        Strategy 1: Non-navigating probe of the current page (member menu, never the possibly restored auth cookie)
+        Strategy 2: Direct page access verification (similar to LinkedIn approach), only when the probe is undecided
         """
+        probed = self.probe_login_state()
+        if probed is not None:
+            print(f"🔍 JobsDB 登录状态 (页面探测): {'已登录' if probed else '未登录'}")
+            return probed
+
         try:
             print("🔍 检测 JobsDB 登录状态...")
             
@@ -111,9 +157,13 @@ class JobsDBAuthenticator(BaseAuthenticator):
             # Step 2: Request verification code
             self.request_verification_code()
             
-            # Step 3: Wait for manual verification code input (similar to LinkedIn security check)
-            # Add a delay to allow page transition after sending verification code
-            time.sleep(5)  # Wait for page to load verification code input form
+            # Step 3: Move on as soon as the page shows what happened to the code request
+            outcome = self.wait_for_login_outcome(self.get_login_outcomes())
+            if outcome == 'error':
+                raise Exception("JobsDB rejected the sign in code request")
+            if outcome == 'feed':
+                print("JobsDB signed in without a verification code.")
+                return
             
             # Step 4: Handle verification process (manual user input with 5-minute timeout)
             self.handle_verification_wait()
@@ -201,9 +251,7 @@ class JobsDBAuthenticator(BaseAuthenticator):
             
             send_button.click()
             print("Verification code request sent")
-            
-            # Wait for page transition
-            time.sleep(random.uniform(2, 4))
+            # The page transition is awaited by wait_for_login_outcome in handle_login
             
         except Exception as e:
             print(f"Error requesting verification code: {e}")
@@ -230,16 +278,13 @@ class JobsDBAuthenticator(BaseAuthenticator):
             print("⏳ Waiting for verification code input...")
             print("(Timeout: 5 minutes)")
             
-            # Monitor for URL changes or login indicators
-            WebDriverWait(self.driver, 300).until(  # 300 seconds = 5 minutes
+            # Wait for the URL to change away from the code entry page (successful verification).
+            # The predicate never navigates, so the page the user is typing into is left alone.
+            WebDriverWait(self.driver, 300, poll_frequency=1).until(  # 300 seconds = 5 minutes
                 lambda driver: (
-                    # Check if URL changed (indicating successful verification)
-                    driver.current_url != current_url or
-                    # Check if we're on logged-in pages
-                    any(indicator in driver.current_url.lower() 
-                        for indicator in ["profile", "member", "dashboard", "feed"]) or
-                    # Check for logged-in indicators on page
-                    self.is_logged_in()
+                    EC.url_changes(current_url)(driver) or
+                    # Check for logged-in indicators on the current page
+                    self.probe_login_state(trust_auth_cookie=True) is True
                 )
             )
             
@@ -265,10 +310,15 @@ class JobsDBAuthenticator(BaseAuthenticator):
     def verify_login_success(self) -> None:
         """Verify that login was successful"""
         try:
-            # Wait for redirect to dashboard/profile
-            WebDriverWait(self.driver, 15).until(
-                lambda d: self.is_logged_in()
-            )
+            # Wait for redirect to dashboard/profile, probing the current page only
+            try:
+                WebDriverWait(self.driver, 15).until(
+                    lambda d: self.probe_login_state(trust_auth_cookie=True) is True
+                )
+            except TimeoutException:
+                # Probe could not decide from the landing page; check once with navigation
+                if not self.is_logged_in():
+                    raise
             
             print("✅ JobsDB login successful!")
             print(f"Current URL: {self.driver.current_url}")
@@ -311,38 +361,9 @@ class JobsDBAuthenticator(BaseAuthenticator):
             print(f"Error during logout: {e}")
 
     def handle_cookie_consent(self):
-        """Handle cookie consent popup if present"""
-        try:
-            # Common cookie consent selectors
-            cookie_selectors = [
-                '//button[contains(text(), "Accept") or contains(text(), "OK") or contains(text(), "Agree")]',
-                '.cookie-accept',
-                '.accept-cookies',
-                '#cookie-accept'
-            ]
-            
-            for selector in cookie_selectors:
-                try:
-                    if selector.startswith('//'):
-                        cookie_button = WebDriverWait(self.driver, 3).until(
-                            EC.element_to_be_clickable((By.XPATH, selector))
-                        )
-                    else:
-                        cookie_button = WebDriverWait(self.driver, 3).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                        )
-                    
-                    cookie_button.click()
-                    print("Cookie consent accepted.")
-                    time.sleep(1)
-                    return
-                    
-                except TimeoutException:
-                    continue
-                    
-        except Exception:
-            # No cookie consent found or error handling it - not critical
-            pass
+        """Dismiss a cookie consent banner (or any other known overlay) with one DOM query, no timed waits"""
+        if self.interstitials.dismiss():
+            time.sleep(0.5)
 
     def start(self):
         """Start authentication process for JobsDB"""
@@ -350,13 +371,22 @@ class JobsDBAuthenticator(BaseAuthenticator):
         self.base_url, self.login_url, self.feed_url = urls
         
         print(f"Starting JobsDB authentication at {self.base_url}")
+        restored = self.restore_session()
+        # Overlays that show up later (consent banners, app prompts, surveys) are dismissed automatically
+        self.interstitials.install_observer()
         self.driver.get(self.base_url)
         self.wait_for_page_load()
         
         # Handle cookie consent if present
         self.handle_cookie_consent()
         
-        if not self.is_logged_in():
-            self.handle_login()
-        else:
+        if self.is_logged_in():
             print("Already logged in to JobsDB.")
+            if not restored:
+                self.session_store.save(self.driver)
+            return
+        
+        self.discard_session(restored)
+        self.handle_login()
+        if self.probe_login_state(trust_auth_cookie=True) is True:
+            self.session_store.save(self.driver)
@@ -3,19 +3,28 @@ import random
 import time
 import traceback
 from typing import List, Optional, Any
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support.ui import Select, WebDriverWait
 import src.utils.utils as utils
 from src.base.base_easy_applier import BaseEasyApplier
 from src.utils.coverLetter import CoverLetterPDF
+from src.jobsdb.document_registry import DocumentRegistry
+from src.jobsdb.card_prefilter import CardPreFilter
+from src.jobsdb.filter_pipeline import FilterPipeline, FilterStage, load_applied_job_ids, salary_upper_bound
+from src.jobsdb.apply_flow import APPLY_STEPS, ApplyProgress
+from src.jobsdb.front_fetch.page_classifier import classify_apply_page, shows_applied_state
+from src.utils.interstitials import InterstitialHandler
+from src.utils.adaptive_wait import adaptive_wait
 import src.utils.strings as strings
 from collections import defaultdict
 import re
 from src.logging.logbase import logBase
-from src.jobsdb.front_fetch.next_card_page import click_next_page
+from src.logging.webdriver_profiler import profile_job
+from src.jobsdb.search_planner import SearchPlanner
+from src.jobsdb.lookahead_scorer import LookAheadScorer
 
 def charIsIn(receiver: str, examiner: list[str]):
     recvlist = receiver.split()
@@ -24,8 +33,101 @@ def charIsIn(receiver: str, examiner: list[str]):
             return True, token.upper()
     return False, None
 
+def normalize_question(text: str) -> str:
+    return " ".join((text or "").split()).lower()
+
 DOCUMENT_STYLE = strings.DOCUMENT_STYLE
 LOG_PATH = "job_apply_logs"
+STEP_ATTEMPTS = 3
+# documents re-uploads files and review clicks submit, so those two run once per attempt
+RETRIED_STEPS = {"questions", "profile"}
+# recorded in completed_steps just before the submit click; its outcome is checked, never re-clicked
+SUBMIT_MARKER = "submitting"
+MAX_STEP_TRANSITIONS = 6
+
+# Single round trip that lists the questions JobsDB has already answered from an earlier
+# application: radio groups with a checked option, dropdowns with a value, and
+# questionnaire checkbox groups with at least one ticked box.
+PREFILLED_QUESTIONS_SCRIPT = """
+const form = arguments[0];
+const answered = [];
+const text = el => (el && el.innerText ? el.innerText.trim() : "");
+form.querySelectorAll("fieldset[role='radiogroup']").forEach(fieldset => {
+    if (fieldset.querySelector("input[type='radio']:checked, input[type='radio'][aria-checked='true']")) {
+        answered.push(text(fieldset.querySelector("legend")));
+    }
+});
+form.querySelectorAll("label[for^='question-']").forEach(label => {
+    const select = document.getElementById(label.getAttribute("for"));
+    if (select && select.tagName === "SELECT" && select.value) {
+        answered.push(text(label));
+    }
+});
+const groups = {};
+document.querySelectorAll("input[type='checkbox'][name^='questionnaire.']").forEach(input => {
+    (groups[input.name] = groups[input.name] || []).push(input);
+});
+Object.values(groups).forEach(inputs => {
+    if (!inputs.some(input => input.checked || input.getAttribute("aria-checked") === "true")) {
+        return;
+    }
+    let node = inputs[0].parentElement;
+    while (node && !(node.tagName === "DIV" && node.querySelector("strong"))) {
+        node = node.parentElement;
+    }
+    answered.push(text(node ? node.querySelector("strong") : null));
+});
+return answered.filter(question => question);
+"""
+
+# Single round trip that collects every question of the role-requirement form with its options
+# and the elements needed to answer it: radio groups, dropdowns and questionnaire checkbox groups.
+FORM_SNAPSHOT_SCRIPT = """
+const form = arguments[0];
+const text = el => (el && el.innerText ? el.innerText.trim() : "");
+const labelFor = input => input.id ? document.querySelector("label[for='" + CSS.escape(input.id) + "']") : null;
+const questions = [];
+form.querySelectorAll("fieldset[role='radiogroup']").forEach(fieldset => {
+    const options = [];
+    fieldset.querySelectorAll("input[type='radio']").forEach(input => {
+        const label = labelFor(input);
+        if (text(label)) {
+            options.push({text: text(label), input: input, label: label});
+        }
+    });
+    questions.push({kind: "radio", question: text(fieldset.querySelector("legend")), options: options});
+});
+form.querySelectorAll("label[for^='question-']").forEach(label => {
+    const select = document.getElementById(label.getAttribute("for"));
+    if (!select || select.tagName !== "SELECT") {
+        return;
+    }
+    const options = Array.from(select.options)
+        .filter(option => option.value && option.text.trim())
+        .map(option => ({text: option.text.trim(), value: option.value}));
+    questions.push({kind: "select", question: text(label), select: select, options: options});
+});
+const groups = {};
+document.querySelectorAll("input[type='checkbox'][name^='questionnaire.']").forEach(input => {
+    (groups[input.name] = groups[input.name] || []).push(input);
+});
+Object.values(groups).forEach(inputs => {
+    let node = inputs[0].parentElement;
+    while (node && !(node.tagName === "DIV" && node.querySelector("strong"))) {
+        node = node.parentElement;
+    }
+    const options = [];
+    inputs.forEach(input => {
+        const label = labelFor(input);
+        const optionText = text(label) || input.value;
+        if (optionText) {
+            options.push({text: optionText, input: input, label: label});
+        }
+    });
+    questions.push({kind: "checkbox", question: text(node ? node.querySelector("strong") : null), options: options});
+});
+return questions.filter(question => question.question && question.options.length);
+"""
 
 class JobsDBEasyApplier(BaseEasyApplier):
     """
@@ -33,21 +135,45 @@ class JobsDBEasyApplier(BaseEasyApplier):
     Handles JobsDB application forms with page navigation instead of modals.
     """
     
-    def __init__(self, driver: Any, resume_dir: Optional[str], set_old_answers: List, gpt_answerer: Any, resume_generator_manager):
+    def __init__(self, driver: Any, resume_dir: Optional[str], set_old_answers: List, gpt_answerer: Any, resume_generator_manager,
+                 verify_prefilled_answers: bool = False, batch_form_answers: bool = False,
+                 concurrent_form_answers: bool = False, searches: Optional[List[dict]] = None,
+                 posting_date_range: Optional[int] = 7, min_salary: Optional[int] = None, lookahead_depth: int = 3):
         super().__init__(driver, resume_dir, set_old_answers, gpt_answerer, resume_generator_manager)
         self.base_url = "https://hk.jobsdb.com"
+        # When True, questions JobsDB pre-filled are still sent to the LLM so stale answers get corrected
+        self.verify_prefilled_answers = verify_prefilled_answers
+        # When True, the role-requirement form is answered with one LLM request (see fillin_form_batch)
+        self.batch_form_answers = batch_form_answers
+        # When True, the form's questions are answered by concurrent LLM calls (see fillin_form_batch)
+        self.concurrent_form_answers = concurrent_form_answers
         self.cover_letter_operator = CoverLetterPDF()
+        self.document_registry = DocumentRegistry()
+        self.interstitials = InterstitialHandler(self.driver)
+        self.apply_progress = ApplyProgress()
+        self.min_salary = min_salary  # salary floor for the filter pipeline, None disables the stage
+        # upcoming cards scored in the background while the current one is processed, 0 disables it
+        self.lookahead_depth = lookahead_depth
+        self.lookahead = None
+        # searches built from config by JobsDBJobManager, see SearchPlanner; job_title is the URL slug of the current one
+        self.job_title, self.job_posting_date_range = "ai-engineer-jobs", posting_date_range
+        self.searches = searches or [self._default_search()]
+        self.current_search = None
         self.logging_system: logBase = logBase(LOG_PATH)
         self.logging_system.start()
 
     def get_job_search_url(self):
-        self.job_title, self.job_posting_date_range = "ai-engineer-jobs", 7
+        """Result page currently being worked through"""
+        if self.current_search:
+            return self.current_search["page_url"]
+        return self.searches[0]["url"]
+
+    def _default_search(self) -> dict:
+        # no positions configured: the original fixed search
         workarrangement, worktype = "1%2C2", "242%2C244"
-        
-        # Added &workarrangement={workarrangement}&worktype={worktype} to the f-string
         target_url = f"{self.base_url}/{self.job_title}?daterange={self.job_posting_date_range}&workarrangement={workarrangement}&worktype={worktype}"
         
-        return target_url
+        return {"url": target_url, "job_title": self.job_title}
     
     def get_platform_selectors(self):
         """Return JobsDB-specific CSS selectors"""
@@ -73,22 +199,38 @@ class JobsDBEasyApplier(BaseEasyApplier):
         }
 
     def iterate_and_apply_jobs(self):
-        """Main method: iterate through all job cards on current page and apply"""
+        """
+        Main method: walk the result pages of every configured search, interleaved by SearchPlanner,
+        and apply to the job cards on them. A job turned up by several searches is evaluated once.
+        """
         seen_job_ids = set()
         max_application = 35
         
         utils.printyellow("JobsDB: Starting job card iteration...")
         
-        job_list_url = self.get_job_search_url()
-        self.driver.get(job_list_url)
+        self.card_prefilter = CardPreFilter(max_age_days=self.job_posting_date_range)
+        self.filter_pipeline = self._build_filter_pipeline()
+        self.lookahead = LookAheadScorer(self.driver, self.gpt_answerer._decide_apply_strategy,
+                                         lambda job: self.card_prefilter.reject_reason(job) or self.filter_pipeline.precheck(job),
+                                         depth=self.lookahead_depth)
+        planner = SearchPlanner(self.searches)
         
         while len(seen_job_ids) < max_application:
+            search = planner.next_page()
+            if search is None:
+                utils.printyellow("JobsDB: All searches exhausted, stopping")
+                break
+            self.current_search, self.job_title = search, search["job_title"]
+            utils.printyellow(f"JobsDB: Search {search['job_title']} page {search['page']}")
+            self.driver.get(search["page_url"])
+            
             job_cards = self._get_all_job_cards()
             current_count = len(job_cards)
             
             utils.printyellow(f"JobsDB: found {current_count} job cards")
+            self.lookahead.prefetch_page(job_cards, seen_job_ids)
             
-            new_jobs_processed = 0
+            new_jobs_processed, unseen_jobs = 0, 0
             for card_index in range(len(job_cards)):
                 try:
                     # Re-fetch cards to avoid stale elements
@@ -101,8 +243,23 @@ class JobsDBEasyApplier(BaseEasyApplier):
                     
                     if job_id in seen_job_ids:
                         continue
+                    unseen_jobs += 1
+                    # the next cards get scored while this one is clicked, read and applied to
+                    self.lookahead.advance(job_cards, card_index, seen_job_ids)
+                    
+                    card_data = self.card_prefilter.harvest(self.driver, card)
+                    reason = self.card_prefilter.reject_reason(card_data)
+                    if reason:
+                        seen_job_ids.add(job_id)
+                        utils.printyellow(f"JobsDB: Skipping card {job_id} before opening it - {reason}")
+                        self.logging_system.add_log_job({
+                            "job_id": job_id, "title": card_data.get("title"), "company": card_data.get("company"),
+                            "platform": "JobsDB", "applied": False, "prefilter_reject": reason,
+                        })
+                        continue
                     
-                    success = self._process_single_job_card(card, job_id)
+                    with profile_job(self.driver, job_id):
+                        success = self._process_single_job_card(card, job_id)
                     seen_job_ids.add(job_id)
                     
                     if success:
@@ -114,18 +271,15 @@ class JobsDBEasyApplier(BaseEasyApplier):
                     utils.printred(f"JobsDB: Error processing card {card_index}: {str(e)}")
                     continue
             
-            utils.printyellow(f"JobsDB: Processed {new_jobs_processed} new jobs this round")
+            utils.printyellow(f"JobsDB: Processed {new_jobs_processed} new jobs this round ({unseen_jobs} not seen in earlier pages)")
+            self.filter_pipeline.report()
+            self.lookahead.report()
+            if hasattr(self.gpt_answerer, "profile_rules"):
+                self.gpt_answerer.profile_rules.report()
+            planner.record_page(search, current_count, unseen_jobs)
             time.sleep(random.uniform(2, 4))
-                
-            if not click_next_page(self.driver, self.logging_system):
-                utils.printyellow("JobsDB: No next page available, stopping")
-                break
-            
-            # # If no new jobs found, stop
-            # if new_jobs_processed == 0:
-            #     utils.printyellow("JobsDB: No new jobs found, iteration complete")
-            #     break
         
+        self.lookahead.close()
         self.logging_system.stop() # place need to change, class should initalized in main.py
         utils.printyellow(f"JobsDB: Iteration complete, processed {len(seen_job_ids)} total jobs")
 
@@ -218,7 +372,6 @@ class JobsDBEasyApplier(BaseEasyApplier):
             job_info["apply_button_type"] = button_text
             job_info["platform"] = "JobsDB"
             job_info["applied"], status = False, False
-            job_info = self.gpt_answerer._decide_apply_strategy(job_info)
             
             if jumped:
                 """
@@ -227,23 +380,56 @@ class JobsDBEasyApplier(BaseEasyApplier):
                 """
                 new_windows, job_list_search_archive_windows = job_list_search_archive_windows, self.get_job_search_url()
             
-            if self._should_apply_by_button_text(button_text):
-                if job_info["apply_decision"]:
-                    status = self._handle_job_application(apply_button, job_info, [new_windows], job_list_search_archive_windows)
-                job_info["applied"] = status
-
-                self.logging_system.add_log_job(job_info)
-                return status
+            # cheap deterministic checks first, the paid LLM score only for jobs that pass them
+            passed, stage, reason = self.filter_pipeline.run(job_info)
+            if passed:
+                status = self._handle_job_application(apply_button, job_info, [new_windows], job_list_search_archive_windows)
+                if status:
+                    self.applied_job_ids.add(str(job_id))
             else:
-                utils.printyellow(f"JobsDB: Skipping - button type: {button_text}")
+                job_info["filter_reject"] = {"stage": stage, "reason": reason}
+                utils.printyellow(f"JobsDB: Skipping - {stage}: {reason}")
+            job_info["applied"] = status
 
             self.logging_system.add_log_job(job_info)
-            return False
+            return status
             
         except Exception as e:
             utils.printred(f"JobsDB: Error processing card {job_id}: {str(e)}")
             return False
 
+    def _build_filter_pipeline(self) -> FilterPipeline:
+        """Stages deciding whether an opened job is applied to, see FilterPipeline"""
+        self.applied_job_ids = load_applied_job_ids(LOG_PATH)
+        return FilterPipeline([
+            FilterStage("button_type", 0, lambda job: None if self._should_apply_by_button_text(job["apply_button_type"]) else f"button type: {job['apply_button_type']}"),
+            FilterStage("blacklist", 0, lambda job: self.card_prefilter.reject_reason({"title": job.get("title", ""), "company": job.get("company", "")})),
+            FilterStage("salary_floor", 0, self._salary_floor_stage),
+            FilterStage("already_seen", 1, lambda job: "applied in an earlier run" if str(job["job_id"]) in self.applied_job_ids else None),
+            FilterStage("llm_score", 100, self._llm_score_stage),
+        ])
+
+    def _salary_floor_stage(self, job_info: dict) -> Optional[str]:
+        if not self.min_salary:
+            return None
+        upper = salary_upper_bound(job_info.get("salary", ""))
+        if upper is not None and upper < self.min_salary:
+            return f"salary {job_info['salary']} below {self.min_salary}"
+        return None
+
+    def _llm_score_stage(self, job_info: dict) -> Optional[str]:
+        speculative = self.lookahead.take(job_info["job_id"]) if self.lookahead else None
+        if speculative is not None and "apply_decision" in speculative:
+            for key in ("apply_decision_score", "apply_decision", "description_tokens"):
+                if key in speculative:
+                    job_info[key] = speculative[key]
+            job_info["scored_ahead"] = True
+        else:
+            self.gpt_answerer._decide_apply_strategy(job_info)
+        if job_info["apply_decision"]:
+            return None
+        return f"LLM score {job_info.get('apply_decision_score')}"
+
     def _click_card_to_open_sidebar(self, card: WebElement):
         """Click card to open sidebar"""
         link_selectors = [
@@ -276,15 +462,12 @@ class JobsDBEasyApplier(BaseEasyApplier):
                 'div[data-automation="jobDetailsPage"]',
             ]
         
+        page_type = "jobsdb_job_page" if jumped else "jobsdb_search"
         for selector in selectors:
-            try:
-                sidebar = WebDriverWait(self.driver, 10).until(
-                    EC.visibility_of_element_located((By.CSS_SELECTOR, selector))
-                )
+            sidebar = adaptive_wait.find(self.driver, page_type, selector, visible=True)
+            if sidebar is not None:
                 utils.printyellow(f"JobsDB: Sidebar loaded with selector: {selector}")
                 return sidebar
-            except Exception:
-                continue
         
         raise Exception("Sidebar load timeout")
 
@@ -406,52 +589,36 @@ class JobsDBEasyApplier(BaseEasyApplier):
             
             # Click apply button
             self._click_with_retry(apply_button)
-            time.sleep(random.uniform(2, 4))
             
             # Check for new tab
             if new_windows[0] is None:
+                WebDriverWait(self.driver, 15).until(lambda d: len(d.window_handles) > len(existing_windows))
                 new_windows = set(self.driver.window_handles) - existing_windows            
                 # Switch to new tab
                 new_window = list(new_windows)[0]
                 self.driver.switch_to.window(new_window)
+                # CDP scripts are per tab: the apply tab gets its own observer, re-installed on every
+                # navigation of the flow; it never clicks inside the application form (see interstitials)
+                self.interstitials.dismiss()
+                self.interstitials.install_observer()
             
-            job_info = self.gpt_answerer.job_info_parser(job_info)
-            job_info["selected_document"] = DOCUMENT_STYLE[job_info["selected_document_index"]]
-            
-            self.cover_letter_operator.load_and_generate(job_info=job_info)
+            job_id = job_info["job_id"]
             try:
-                time.sleep(2)
-                
-                self.document_page_control() # include resume select and cover letter selection
-                
-                time.sleep(random.uniform(1, 3))
-                current_url = self.driver.current_url
-                if re.search(r'role-requirement?', str(current_url)):
-                    self.fillin_form()  # include personal information fill-in
-                
-                    time.sleep(random.uniform(1, 4))
-                    self.press_continuous_button() # press continue button in fillin form page
-                
-                time.sleep(random.uniform(2,5))
-                
-                self.press_continuous_button() # press continue button in "Update Jobsdb Profile" page
-                
-                time.sleep(random.uniform(2,5))
-
-                url_before_submit = self.driver.current_url
-                self.press_continuous_button(False, True) # press continue button in "Review and Submit" page
-
-                # Wait for the success/confirmation page to load before closing
-                try:
-                    WebDriverWait(self.driver, 15).until(
-                        lambda d: d.current_url != url_before_submit
-                    )
-                    utils.printyellow(f"JobsDB: Submission confirmed, landed on: {self.driver.current_url}")
-                except TimeoutException:
-                    # URL didn't change; still give extra time for any in-page confirmation
-                    utils.printyellow("JobsDB: URL did not change after submit, waiting extra time...")
-                    time.sleep(3)
-
+                progress = self.apply_progress.start_attempt(job_id)
+                if SUBMIT_MARKER in progress["completed_steps"]:
+                    return self._resolve_earlier_submit(job_info)
+                if self.apply_progress.exhausted(progress):
+                    utils.printred(f"JobsDB: Giving up on {job_id} after {progress['attempts'] - 1} failed attempts")
+                    self.apply_progress.finish(job_id)
+                    return False
+                self._prepare_application(job_info, progress)
+                applied = self._run_apply_steps(job_id)
+                job_info["apply_step_timings"] = self.step_timings
+                if not applied:
+                    utils.printred(f"JobsDB: Current URL when failed: {self.driver.current_url}")
+                    return False
+
+                self.apply_progress.finish(job_id)
                 utils.printyellow(f"JobsDB: Applied to {job_info['title']} at {job_info['company']}")
                 return True
                 
@@ -471,27 +638,183 @@ class JobsDBEasyApplier(BaseEasyApplier):
             utils.printred(f"JobsDB: Application failed: {str(e)}")
             return False
 
+    def _resolve_earlier_submit(self, job_info: dict) -> bool:
+        """
+        An earlier attempt may have clicked submit without seeing the outcome. Never submit again: the job
+        counts as applied when JobsDB shows it so, otherwise its record is kept and flagged for a manual check.
+        """
+        job_id = job_info["job_id"]
+        if classify_apply_page(self.driver, timeout=10) == "confirmation" or shows_applied_state(self.driver):
+            utils.printyellow(f"JobsDB: {job_info['title']} at {job_info['company']} was submitted in an earlier attempt")
+            self.apply_progress.finish(job_id)
+            return True
+        utils.printred(f"JobsDB: Submit outcome of {job_id} from an earlier attempt is unknown, needs manual check")
+        self.apply_progress.update(job_id, needs_manual_check=True)
+        return False
+
+    def _prepare_application(self, job_info: dict, progress: dict) -> None:
+        """
+        LLM job parsing and cover letter generation. Both are kept in the apply progress,
+        so another attempt at the same job reuses them instead of paying for them again.
+        """
+        if progress.get("job_info"):
+            utils.printyellow("JobsDB: Reusing parsed job info from an earlier attempt")
+            job_info.update(progress["job_info"])
+        else:
+            self.gpt_answerer.job_info_parser(job_info)
+            job_info["selected_document"] = DOCUMENT_STYLE[job_info["selected_document_index"]]
+            self.apply_progress.update(job_info["job_id"], job_info=job_info)
+
+        resume_path, cover_letter_path = progress.get("resume_path"), progress.get("cover_letter_path")
+        if resume_path and cover_letter_path and os.path.exists(resume_path) and os.path.exists(cover_letter_path):
+            utils.printyellow("JobsDB: Reusing cover letter generated in an earlier attempt")
+            self.cover_letter_operator.resume_path = resume_path
+            self.cover_letter_operator.pdf = cover_letter_path
+            return
+
+        self.cover_letter_operator.load_and_generate(job_info=job_info)
+        self.apply_progress.update(
+            job_info["job_id"],
+            resume_path=str(self.cover_letter_operator.get_resume_path()),
+            cover_letter_path=str(self.cover_letter_operator.get_cover_letter_path()),
+        )
+
+    def _run_apply_steps(self, job_id: str) -> bool:
+        """
+        Walk the apply pages as explicit steps (see apply_flow.APPLY_STEPS). The page is classified
+        (URL plus one DOM signature query) before every step, so the matching handler runs as soon as
+        the page is there and pages JobsDB does not show for this job are skipped. A transient
+        failure (timeout, stale element) retries only the step it happened in, and only for the
+        steps in RETRIED_STEPS. Steps completed in an earlier attempt are continued past instead of
+        redone. SUBMIT_MARKER is recorded right before the submit click, so no attempt clicks it twice.
+        Time spent detecting and handling each step is kept in self.step_timings.
+        """
+        handlers = {
+            "documents": self.document_page_control,
+            "questions": self._answer_questions_step,
+            "profile": self.press_continuous_button,
+        }
+        self.step_timings = {}
+        try:
+            for _ in range(MAX_STEP_TRANSITIONS):
+                detect_start = time.perf_counter()
+                completed = self.apply_progress.get(job_id)["completed_steps"]
+                step = classify_apply_page(self.driver) or self._next_pending_step(completed)
+                detect_seconds = time.perf_counter() - detect_start
+                utils.printyellow(f"JobsDB: Apply step '{step}' detected in {detect_seconds:.2f}s ({self.driver.current_url})")
+
+                if step == "confirmation":
+                    utils.printyellow(f"JobsDB: Submission confirmed, landed on: {self.driver.current_url}")
+                    return True
+
+                step_start = time.perf_counter()
+                if step == "review":
+                    done = self._run_apply_step(step, lambda: self._submit_application(job_id), attempts=1)
+                elif step in completed:
+                    utils.printyellow(f"JobsDB: Step '{step}' was done in an earlier attempt, continuing past it")
+                    done = self._run_apply_step(step, self.press_continuous_button, attempts=1)
+                    if not done:  # JobsDB did not keep that page's inputs, fill it again
+                        done = self._run_apply_step(step, handlers[step], attempts=self._step_attempts(step))
+                else:
+                    done = self._run_apply_step(step, handlers[step], attempts=self._step_attempts(step))
+                self.step_timings[step] = {
+                    "detect_s": round(detect_seconds, 2),
+                    "handle_s": round(time.perf_counter() - step_start, 2),
+                }
+                if step == "review" or not done:
+                    return done
+                self.apply_progress.complete_step(job_id, step)
+
+            utils.printred("JobsDB: Apply flow did not reach the review page")
+            return False
+        finally:
+            self.apply_progress.update(job_id, step_timings=self.step_timings)
+
+    @staticmethod
+    def _next_pending_step(completed: list) -> str:
+        """Fallback for an unrecognised URL: the next step in the usual order, questions only when detected"""
+        for step in APPLY_STEPS:
+            if step != "questions" and step not in completed:
+                return step
+        return "confirmation"
+
+    @staticmethod
+    def _step_attempts(step: str) -> int:
+        return STEP_ATTEMPTS if step in RETRIED_STEPS else 1
+
+    def _run_apply_step(self, step: str, handler, attempts: int = STEP_ATTEMPTS) -> bool:
+        """Run one step and wait until it leaves the page; transient failures retry this step only"""
+        for attempt in range(1, attempts + 1):
+            url_before = self.driver.current_url
+            try:
+                handler()
+                if step != "review":
+                    WebDriverWait(self.driver, 15).until(lambda d: d.current_url != url_before)
+                return True
+            except (TimeoutException, StaleElementReferenceException) as e:
+                if self.driver.current_url != url_before:
+                    return True  # the page moved on even though the handler complained
+                utils.printyellow(f"JobsDB: Step '{step}' attempt {attempt}/{attempts} failed ({type(e).__name__})")
+        utils.printred(f"JobsDB: Step '{step}' failed after {attempts} attempt(s)")
+        return False
+
+    def _answer_questions_step(self):
+        """role-requirement page: employer questions"""
+        self.fillin_form()
+        self.press_continuous_button()
+
+    def _submit_application(self, job_id: str):
+        """
+        Review and Submit page. SUBMIT_MARKER is recorded once the button is found and just before it is
+        clicked; a failure before that (button never clickable) leaves the job free to be submitted later.
+        """
+        url_before_submit = self.driver.current_url
+        btn = WebDriverWait(self.driver, 20).until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, "button[data-testid='review-submit-application']"))
+        )
+        self.apply_progress.complete_step(job_id, SUBMIT_MARKER)
+        btn.click()
+
+        # Wait for the success/confirmation page to load before closing
+        try:
+            WebDriverWait(self.driver, 15).until(
+                lambda d: d.current_url != url_before_submit
+            )
+            utils.printyellow(f"JobsDB: Submission confirmed, landed on: {self.driver.current_url}")
+        except TimeoutException:
+            # URL didn't change; still give extra time for any in-page confirmation
+            utils.printyellow("JobsDB: URL did not change after submit, waiting extra time...")
+            time.sleep(3)
+
     def document_page_control(self):
         """
         resume selection and cover letter upload
+        A document already on file with JobsDB (same content hash) is selected from the saved
+        documents instead of being uploaded again; only new documents go through info_upload.
         """
         resume_upload={
             "name": "resume",
             "fieldset": "id^='resume-method-'",
             "inputset": "resume-method-upload",
-            "input_click": "resume-fileFile"
+            "input_click": "resume-fileFile",
+            "reuse_inputset": "resume-method-change",
         }
         coverletter_upload = {
             "name": "coverLetter",
             "fieldset": "id^='coverLetter-method-'",
             "inputset": "coverLetter-method-upload",
-            "input_click": "coverLetter-fileFile"
+            "input_click": "coverLetter-fileFile",
+            "reuse_inputset": None,  # JobsDB keeps no saved cover letters to pick from
         }
 
-        self.info_upload(web_pattern=resume_upload)
-        self.info_upload(web_pattern=coverletter_upload)
+        uploaded = False
+        for web_pattern in (resume_upload, coverletter_upload):
+            if not self.reuse_uploaded_document(web_pattern):
+                self.info_upload(web_pattern=web_pattern)
+                uploaded = True
         
-        time.sleep(random.uniform(3,5))
+        if uploaded:
+            time.sleep(random.uniform(3,5))
 
         btn = WebDriverWait(self.driver, 20).until(
         EC.element_to_be_clickable((By.CSS_SELECTOR, "button[data-testid='continue-button']"))
@@ -502,6 +825,50 @@ class JobsDBEasyApplier(BaseEasyApplier):
         return True
 
 
+    def _document_path(self, name: str) -> str:
+        if name == "resume":
+            return self.cover_letter_operator.get_resume_path()
+        return self.cover_letter_operator.get_cover_letter_path()
+
+    def reuse_uploaded_document(self, web_pattern: dict) -> bool:
+        """
+        Pick a document JobsDB already has on file instead of uploading it again.
+        Returns False (caller falls back to info_upload) when the document content is new,
+        the radiogroup has no saved-document option, or the saved copy can't be found.
+        """
+        if not web_pattern.get("reuse_inputset"):
+            return False
+        doc_path = self._document_path(web_pattern['name'])
+        entry = self.document_registry.lookup(web_pattern['name'], str(doc_path))
+        if entry is None:
+            return False
+
+        try:
+            wait = WebDriverWait(self.driver, 20, poll_frequency=0.2)
+            group = wait.until(
+                EC.visibility_of_element_located((By.CSS_SELECTOR, f"fieldset[role='radiogroup'][{web_pattern['fieldset']}]"))
+            )
+            reuse_radio = group.find_element(By.CSS_SELECTOR, f"input[type='radio'][data-testid={web_pattern['reuse_inputset']}]")
+            if not (reuse_radio.is_selected() or reuse_radio.get_attribute("aria-checked") == "true"):
+                reuse_label = group.find_element(By.CSS_SELECTOR, f"label[for='{reuse_radio.get_attribute('id')}']")
+                self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", reuse_label)
+                reuse_label.click()
+                wait.until(lambda d: reuse_radio.is_selected() or reuse_radio.get_attribute("aria-checked") == "true")
+
+            # The saved-document dropdown is rendered once the option is selected
+            dropdown = wait.until(lambda d: (group.find_elements(By.CSS_SELECTOR, "select") or [None])[0])
+            file_stem = os.path.splitext(entry["file_name"])[0].lower()
+            select = Select(dropdown)
+            for option in select.options:
+                if file_stem in option.text.lower():
+                    select.select_by_value(option.get_attribute("value"))
+                    utils.printyellow(f"JobsDB: Reused {web_pattern['name']} already on file: {option.text.strip()}")
+                    return True
+            utils.printyellow(f"JobsDB: {entry['file_name']} not among saved documents, uploading instead")
+        except Exception as e:
+            utils.printred(f"JobsDB: Could not reuse saved {web_pattern['name']}, uploading instead: {str(e)}")
+        return False
+
     def info_upload(self, web_pattern: dict):
         """Upload document to JobsDB application form"""
         try:
@@ -555,9 +922,7 @@ class JobsDBEasyApplier(BaseEasyApplier):
             """, file_input)
             
             # 6) Upload file
-            doc_path = self.cover_letter_operator.get_cover_letter_path()
-            if web_pattern['name'] == "resume":
-                doc_path = self.cover_letter_operator.get_resume_path()
+            doc_path = self._document_path(web_pattern['name'])
 
             if not doc_path or not os.path.exists(doc_path):
                 raise Exception(f"{web_pattern['name']} file not found")
@@ -569,6 +934,7 @@ class JobsDBEasyApplier(BaseEasyApplier):
             file_name = os.path.basename(doc_path)
             wait.until(lambda d: file_name.lower() in (file_input.get_attribute("value") or "").lower())
             utils.printyellow("JobsDB: Upload confirmed")
+            self.document_registry.record(web_pattern['name'], str(doc_path))
             
             time.sleep(random.uniform(1, 3))
             
@@ -589,15 +955,21 @@ class JobsDBEasyApplier(BaseEasyApplier):
             )
             utils.printyellow("JobsDB: Form loaded successfully")
             
+            prefilled = self.detect_prefilled_questions(form)
+            
+            if (self.batch_form_answers or self.concurrent_form_answers) and self.fillin_form_batch(form, prefilled):
+                utils.printyellow("JobsDB: Form filling completed successfully")
+                return True
+            
             # Process single select problems (radio buttons)
             try: 
-                self.capture_single_select_problem(form)
+                self.capture_single_select_problem(form, prefilled)
                 
                 time.sleep(random.uniform(1, 4))
                 # Process dropdown problems
-                self.capture_dropdown_problem(form)
+                self.capture_dropdown_problem(form, prefilled)
                 time.sleep(random.uniform(1, 4))
-                self.capture_multi_select_problem()
+                self.capture_multi_select_problem(prefilled)
             except Exception as e:
                 utils.printred(f"JobsDB: Seems part of question isnt asked, Error processing form problems: {str(e)}")
             
@@ -608,11 +980,99 @@ class JobsDBEasyApplier(BaseEasyApplier):
             utils.printred(f"JobsDB: Form filling failed or job not require side question answering: {str(e)}")
             raise
 
-    def capture_single_select_problem(self, form: WebElement):
+    def fillin_form_batch(self, form: WebElement, prefilled: set) -> bool:
+        """
+        Batch mode: read every question from one DOM snapshot, answer them all in one LLM request
+        and apply the answers in a single pass. Questions the batch reply leaves out are answered
+        one by one. Returns False when the snapshot fails, so the caller uses the per-question path.
+        In concurrent mode the questions are answered by separate LLM calls run concurrently instead.
+        """
+        try:
+            snapshot = self.driver.execute_script(FORM_SNAPSHOT_SCRIPT, form) or []
+        except Exception as e:
+            utils.printred(f"JobsDB: Form snapshot failed, answering question by question: {str(e)}")
+            return False
+
+        questions, pending = {}, {}
+        for index, block in enumerate(snapshot):
+            if normalize_question(block["question"]) in prefilled:
+                continue
+            question_id = f"q{index + 1}"
+            block["keys"] = {chr(65 + j): option for j, option in enumerate(block["options"])}
+            questions[question_id] = block
+            pending[question_id] = {
+                "Question": block["question"],
+                "options": {key: option["text"] for key, option in block["keys"].items()},
+                "multi_select": block["kind"] == "checkbox",
+            }
+        utils.printyellow(f"JobsDB: {len(pending)} question(s) to answer in one batch")
+        if not pending:
+            return True
+
+        try:
+            if self.batch_form_answers:
+                answers = self.gpt_answerer.answer_questions_batch(pending)
+            else:
+                answers = self.gpt_answerer.answer_questions({
+                    question_id: {key: question[key] for key in ("Question", "options", "multi_select")} for question_id, question in pending.items()
+                })
+        except Exception as e:
+            utils.printred(f"JobsDB: Batch answering failed: {str(e)}")
+            answers = {}
+
+        for question_id, block in questions.items():
+            try:
+                answer = answers.get(question_id)
+                if answer is None:
+                    answer = self.gpt_answerer.standard_simplified_profile_chain({key: pending[question_id][key] for key in ("Question", "options", "multi_select")})
+                keys = [key for part in answer for key in re.findall(r"\b[A-Z]\b", str(part).strip().upper()) if key in block["keys"]]
+                if not keys:
+                    utils.printred(f"JobsDB: Answer {answer} matches no option of: {block['question']}")
+                    continue
+                if block["kind"] != "checkbox":
+                    keys = keys[:1]
+                self._apply_batch_answer(block, keys)
+                utils.printyellow(f"JobsDB: {block['question']} -> {[block['keys'][key]['text'] for key in keys]}")
+            except Exception as e:
+                utils.printred(f"JobsDB: Error answering '{block['question']}': {str(e)}")
+                continue
+        return True
+
+    def _apply_batch_answer(self, block: dict, keys: List[str]) -> None:
+        if block["kind"] == "select":
+            Select(block["select"]).select_by_value(block["keys"][keys[0]]["value"])
+            return
+        for key in keys:
+            option = block["keys"][key]
+            if option["input"].is_selected():
+                continue
+            self._click_with_retry(option["label"] if option.get("label") is not None else option["input"])
+
+    def detect_prefilled_questions(self, form: WebElement) -> set:
+        """
+        Pre-pass over the form: return the normalized texts of questions JobsDB has already
+        answered (remembered from an earlier application) so the capture methods can skip them.
+        Returns an empty set in verify mode, so every question is re-asked.
+        """
+        if self.verify_prefilled_answers:
+            utils.printyellow("JobsDB: Verify mode on, pre-filled answers will be re-checked")
+            return set()
+        try:
+            answered = self.driver.execute_script(PREFILLED_QUESTIONS_SCRIPT, form) or []
+        except Exception as e:
+            utils.printred(f"JobsDB: Pre-filled question detection failed: {str(e)}")
+            return set()
+        prefilled = {normalize_question(question) for question in answered}
+        utils.printyellow(f"JobsDB: {len(prefilled)} question(s) already answered by JobsDB, skipping them")
+        return prefilled
+
+    def capture_single_select_problem(self, form: WebElement, prefilled: Optional[set] = None):
         """
         Capture and answer single select problems (radio button groups) in JobsDB form
         Based on observed structure: fieldset with role='radiogroup' containing question and options
+        Questions listed in prefilled (see detect_prefilled_questions) are skipped.
         """
+        prefilled = prefilled or set()
         utils.printyellow("JobsDB: Processing single select problems...")
         
         # Find all fieldset elements with role='radiogroup' (single select problems)
@@ -641,6 +1101,10 @@ class JobsDBEasyApplier(BaseEasyApplier):
                     utils.printred(f"JobsDB: Empty question text for single select {i+1}")
                     continue
                 
+                if normalize_question(question_text) in prefilled:
+                    utils.printyellow(f"JobsDB: Single select {i+1} already answered, skipping")
+                    continue
+                
                 # 2. Extract all radio options
                 radio_inputs = fieldset.find_elements(By.CSS_SELECTOR, "input[type='radio']")
                 
@@ -696,6 +1160,10 @@ class JobsDBEasyApplier(BaseEasyApplier):
                     if inrelation:
                         radio_element = option_elements[selected_option]
                         
+                        if radio_element.is_selected():
+                            utils.printyellow(f"JobsDB: Option {selected_option} already selected")
+                            continue
+                        
                         # Scroll to element and click
                         self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", radio_element)
                         time.sleep(0.2)
@@ -718,11 +1186,13 @@ class JobsDBEasyApplier(BaseEasyApplier):
         utils.printyellow("JobsDB: Finished processing all single select problems")
             
 
-    def capture_dropdown_problem(self, form: WebElement):
+    def capture_dropdown_problem(self, form: WebElement, prefilled: Optional[set] = None):
         """
         Capture and answer dropdown problems in JobsDB form
         Based on markdown instructions: find label[for^='question-'] and corresponding select elements
+        Questions listed in prefilled (see detect_prefilled_questions) are skipped.
         """
+        prefilled = prefilled or set()
         try:
             utils.printyellow("JobsDB: Processing dropdown problems...")
             
@@ -740,9 +1210,13 @@ class JobsDBEasyApplier(BaseEasyApplier):
                 try:
                     utils.printyellow(f"JobsDB: Processing dropdown problem {i+1}")
                     
+                    question_text = asked_question.text.strip()
+                    if normalize_question(question_text) in prefilled:
+                        utils.printyellow(f"JobsDB: Dropdown {i+1} already answered, skipping")
+                        continue
+                    
                     # Extract options from select element
                     given_options = answers.find_elements(By.CSS_SELECTOR, "option")
-                    question_text = asked_question.text.strip()
                     options = {}
                     option_values = {}
                     key_index = 0
@@ -821,12 +1295,13 @@ class JobsDBEasyApplier(BaseEasyApplier):
         Robust method to extract all questionnaire questions (both checkbox and radio)
         Returns structured data for both single-select and multi-select problems
         """
-        # Wait until at least one questionnaire input is present
-        WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_element_located(
-                (By.XPATH, "//input[(self::input) and (@type='checkbox' or @type='radio') and starts-with(@name,'questionnaire.')]")
-            )
-        )
+        # Wait until at least one questionnaire input is present; a rendered form without one has no questionnaire
+        if adaptive_wait.find(
+            self.driver, "jobsdb_questions",
+            "//input[(self::input) and (@type='checkbox' or @type='radio') and starts-with(@name,'questionnaire.')]",
+            by=By.XPATH, signature="form button[data-testid='continue-button']", ceiling=timeout,
+        ) is None:
+            return []
 
         # 1) Collect all inputs belonging to any questionnaire question
         inputs = self.driver.find_elements(
@@ -895,11 +1370,13 @@ class JobsDBEasyApplier(BaseEasyApplier):
 
         return questions
 
-    def capture_multi_select_problem(self):
+    def capture_multi_select_problem(self, prefilled: Optional[set] = None):
         """
         Improved multi-select checkbox problem handler using robust question block extraction
         Maintains compatibility with existing AI question format and data structures
+        Questions listed in prefilled (see detect_prefilled_questions) are skipped.
         """
+        prefilled = prefilled or set()
         print("JobsDB: Processing multi-select problems...")
         
         try:
@@ -929,6 +1406,10 @@ class JobsDBEasyApplier(BaseEasyApplier):
                         print(f"JobsDB: Empty question text for multi-select {i+1}")
                         continue
                     
+                    if normalize_question(question_text) in prefilled:
+                        print(f"JobsDB: Multi-select {i+1} already answered, skipping")
+                        continue
+                    
                     # Convert to original format expected by AI
                     options = {}
                     option_elements = {}
@@ -950,7 +1431,8 @@ class JobsDBEasyApplier(BaseEasyApplier):
                     # 3. Prepare question for AI (maintaining original format)
                     ai_question = {
                         "Question": question_text,
-                        "options": options
+                        "options": options,
+                        "multi_select": True
                     }
                     
                     print(f"JobsDB: Question: {question_text}")
@@ -1,5 +1,6 @@
 import random
 import time
+from itertools import product
 from typing import Dict, Any, List, Optional
 from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.by import By
@@ -8,9 +9,15 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 import src.utils.utils as utils
+from src.base.base_job_manager import EnvironmentKeys
 from src.utils.job import Job
 from src.jobsdb.jobsdb_easy_applier import JobsDBEasyApplier 
 
+# JobsDB search query codes
+WORK_TYPE_CODES = {"full-time": "242", "part-time": "243", "contract": "244", "temporary": "244", "internship": "245"}
+WORK_ARRANGEMENT_CODES = {"on-site": "1", "hybrid": "2", "remote": "3"}
+DATE_RANGE_DAYS = {"all time": None, "month": 31, "week": 7, "24 hours": 1}
+
 
 class JobsDBJobManager:
     """
@@ -30,7 +37,65 @@ class JobsDBJobManager:
         # Minimal parameter setup for JobsDB
         self.parameters = parameters
         self.resume_path = parameters.get('uploads', {}).get('resume', None)
+        self.env_config = EnvironmentKeys()
+        self.jobsdb_config = parameters.get('jobsdb', {}) or {}
+        self.positions = parameters.get('positions', [])
+        self.locations = parameters.get('locations', [])
+        self.posting_date_range = next(
+            (days for key, days in DATE_RANGE_DAYS.items() if parameters.get('date', {}).get(key)), None
+        )
+
+    @staticmethod
+    def _slug(text: str) -> str:
+        return "-".join(text.strip().split())
+
+    def get_base_search_url(self, parameters) -> str:
+        """Query string for the server-side JobsDB filters: date range, work type/arrangement, salary, classification, sort"""
+        jobsdb = parameters.get('jobsdb', {}) or {}
+        url_parts = []
+        if self.posting_date_range:
+            url_parts.append(f"daterange={self.posting_date_range}")
+
+        work_types = sorted({WORK_TYPE_CODES[key] for key, value in parameters.get('jobTypes', {}).items() if value and key in WORK_TYPE_CODES})
+        if work_types:
+            url_parts.append(f"worktype={'%2C'.join(work_types)}")
+
+        arrangements = jobsdb.get('workArrangement') or (['remote'] if parameters.get('remote') else [])
+        arrangement_codes = sorted(WORK_ARRANGEMENT_CODES[a] for a in arrangements)
+        if arrangement_codes:
+            url_parts.append(f"workarrangement={'%2C'.join(arrangement_codes)}")
+
+        salary_min, salary_max = jobsdb.get('salaryMin'), jobsdb.get('salaryMax')
+        if salary_min or salary_max:
+            url_parts.append(f"salaryrange={salary_min or 0}-{salary_max or ''}")
+            url_parts.append(f"salarytype={jobsdb.get('salaryType', 'monthly')}")
+
+        if jobsdb.get('classification'):
+            url_parts.append(f"classification={jobsdb['classification']}")
+        if jobsdb.get('sortByDate', True):
+            url_parts.append("sortmode=ListedDate")
+        return "&".join(url_parts)
+
+    def get_search_url(self, position: str, location: Optional[str] = None) -> str:
+        """https://hk.jobsdb.com/<position>-jobs[/in-<location>]?<filters>"""
+        path = f"/{self._slug(position).lower()}-jobs"
+        location = self.jobsdb_config.get('location', location)
+        if location:
+            path += f"/in-{self._slug(location)}"
+        query = self.get_base_search_url(self.parameters)
+        return f"{self.base_url}{path}" + (f"?{query}" if query else "")
         
+    def get_searches(self) -> List[Dict[str, str]]:
+        """One search per position x location (a jobsdb.location in config replaces the locations), duplicates removed"""
+        locations = [self.jobsdb_config['location']] if self.jobsdb_config.get('location') else (self.locations or [None])
+        searches, seen_urls = [], set()
+        for position, location in product(self.positions, locations):
+            url = self.get_search_url(position, location)
+            if url not in seen_urls:
+                seen_urls.add(url)
+                searches.append({"url": url, "job_title": f"{self._slug(position).lower()}-jobs"})
+        return searches
+
     def set_gpt_answerer(self, gpt_answerer):
         self.gpt_answerer = gpt_answerer
         
@@ -39,12 +104,22 @@ class JobsDBJobManager:
     
     def _create_easy_applier_component(self):
         """Create JobsDB-specific easy applier component"""
+        search = {}
+        if self.positions:
+            search["searches"] = self.get_searches()
+            search["posting_date_range"] = self.posting_date_range
         return JobsDBEasyApplier(
             self.driver, 
             self.resume_path, 
             self.set_old_answers, 
             self.gpt_answerer, 
-            self.resume_generator_manager
+            self.resume_generator_manager,
+            verify_prefilled_answers=self.env_config.verify_prefilled_answers,
+            batch_form_answers=self.env_config.batch_form_answers,
+            concurrent_form_answers=self.env_config.concurrent_form_answers,
+            lookahead_depth=self.env_config.lookahead_depth,
+            min_salary=self.jobsdb_config.get('salaryMin'),
+            **search
         )
      
     def apply_jobs(self):
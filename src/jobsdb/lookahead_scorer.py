@@ -0,0 +1,198 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from selenium.webdriver.remote.webelement import WebElement
+import src.utils.utils as utils
+
+# Starts fetching the detail pages of the given cards from inside the browser (its cookies, no navigation) and
+# returns right away with the job ids it started. Each page is parsed like sidebar_job_detail does, plus the card
+# fields CardPreFilter reads, and left in window.__lookaheadPrefetch[job id] for DETAIL_COLLECT_SCRIPT.
+DETAIL_PREFETCH_SCRIPT = """
+const cards = arguments[0], skip = new Set(arguments[1]);
+const store = window.__lookaheadPrefetch = window.__lookaheadPrefetch || {};
+const text = el => (el ? (el.innerText || el.textContent || "").trim() : "");
+const sections = root => {
+    const result = {};
+    let title = null, buffer = [], introIdx = 1;
+    const flush = () => { if (title && buffer.length) result[title] = buffer.filter(Boolean).join("\\n"); };
+    for (const child of Array.from(root.children)) {
+        const strong = Array.from(child.querySelectorAll("strong")).find(el => text(el));
+        if (strong) {
+            flush();
+            buffer = [];
+            const titleRaw = text(strong);
+            title = titleRaw.replace(/[:：]+$/, "");
+            const remaining = text(child).replace(titleRaw, "").trim();
+            if (remaining) buffer.push(remaining);
+            continue;
+        }
+        const tag = child.tagName.toLowerCase();
+        const content = (tag === "ul" || tag === "ol")
+            ? Array.from(child.children).filter(li => li.tagName.toLowerCase() === "li").map(text).filter(Boolean).join("\\n")
+            : text(child);
+        if (content) {
+            if (!title) title = "Intro" + introIdx++;
+            buffer.push(content);
+        }
+    }
+    flush();
+    return result;
+};
+const fetchDetails = async (href, jobId, cardFields) => {
+    try {
+        const response = await fetch(href, {credentials: "include"});
+        if (!response.ok) return null;
+        const doc = new DOMParser().parseFromString(await response.text(), "text/html");
+        const details = doc.querySelector('div[data-automation="jobAdDetails"]');
+        if (!details) return null;
+        const pick = selector => text(doc.querySelector(selector));
+        return {
+            job_id: jobId,
+            link: href,
+            title: pick('h1[data-automation="job-detail-title"]'),
+            company: pick('[data-automation="advertiser-name"]'),
+            work_style: pick('[data-automation="job-detail-work-type"]'),
+            salary: pick('[data-automation="job-detail-salary"]'),
+            apply_button_type: pick('[data-automation="job-detail-apply"]'),
+            detailed_page: sections(details),
+            ...cardFields,
+        };
+    } catch (e) {
+        return null;
+    }
+};
+const started = [];
+for (const card of cards) {
+    const link = card.querySelector('a[data-automation="job-list-item-link-overlay"], a[data-automation="jobTitle"], a[href*="/job/"]');
+    const href = link ? link.href : "";
+    const match = href.match(/\\/job\\/(\\d+)/);
+    const jobId = card.getAttribute("data-job-id") || (match ? match[1] : null);
+    if (!href || !jobId || skip.has(jobId) || jobId in store) continue;
+    const badges = Array.from(card.querySelectorAll("span, div, a"))
+        .filter(el => el.children.length === 0)
+        .map(el => text(el).toLowerCase());
+    const cardFields = {
+        listed: text(card.querySelector("[data-automation='jobListingDate']")),
+        quick_apply: badges.includes("quick apply") || card.querySelector("[data-automation*='quick-apply' i], [data-automation*='quickApply' i]") !== null,
+        external_apply: card.querySelector("[data-automation*='external' i]") !== null,
+    };
+    store[jobId] = {pending: true};
+    started.push(jobId);
+    fetchDetails(href, jobId, cardFields).then(result => { store[jobId] = result || {failed: true}; });
+}
+return started;
+"""
+
+# The prefetches among the given job ids that have finished: {done: [job ids], ready: [parsed entries]}, failed
+# fetches are done but not ready. Collected entries are marked so a card is never fetched twice on the page.
+DETAIL_COLLECT_SCRIPT = """
+const store = window.__lookaheadPrefetch || {};
+const done = [], ready = [];
+for (const jobId of arguments[0]) {
+    const entry = store[jobId];
+    if (entry && entry.pending) continue;
+    done.push(jobId);  // finished, or gone with a page load
+    if (entry && !entry.failed && !entry.collected) ready.push(entry);
+    store[jobId] = {collected: true};
+}
+return {done, ready};
+"""
+
+
+class LookAheadScorer:
+    """
+    Scores the next `depth` job cards in the background while the browser works on the current one.
+
+    Detail pages are fetched ahead of the cursor without blocking: prefetch_page() starts the first `depth`
+    cards of a results page, and advance(), called as the applier reaches a card, starts the cards entering
+    the `depth` window after it. Neither waits for a fetch; advance() also collects the fetches that have
+    finished and submits their LLM apply-decision to a thread pool, skipping cards that fail precheck (the
+    card prefilter and the pipeline's cheap stages). When the applier reaches the card, take() hands back
+    the finished (or still running) score instead of starting a new LLM call. Cards that were never
+    scheduled, or whose prefetch failed or had not finished, return None and are scored inline as before.
+    A new page cancels and drops whatever the previous page left pending.
+    """
+
+    def __init__(self, driver, score: Callable[[dict], dict], precheck: Callable[[dict], Optional[str]], depth: int = 3):
+        self.driver = driver
+        self.score = score
+        self.precheck = precheck
+        self.depth = depth
+        self.executor = ThreadPoolExecutor(max_workers=max(1, depth), thread_name_prefix="lookahead")
+        self.pending: Dict[str, Future] = {}
+        self.requested = set()  # fetches started in the browser and not collected yet
+        self.attempted = set()
+        self.hits = 0
+        self.misses = 0
+
+    def prefetch_page(self, cards: List[WebElement], skip_ids: set) -> None:
+        """Drop the previous page's look-ahead and start fetching the cards after this page's first one"""
+        self.reset()
+        self._start(cards[1:1 + self.depth], skip_ids)
+
+    def advance(self, cards: List[WebElement], index: int, skip_ids: set) -> None:
+        """The applier reached cards[index]: score what has been fetched and start fetching the next `depth` cards"""
+        self._collect(skip_ids)
+        self._start(cards[index + 1:index + 1 + self.depth], skip_ids)
+
+    def _start(self, cards: List[WebElement], skip_ids: set) -> None:
+        if not self.depth or not cards:
+            return
+        try:
+            skip = sorted(self.attempted | {str(job_id) for job_id in skip_ids})
+            started = self.driver.execute_script(DETAIL_PREFETCH_SCRIPT, cards, skip) or []
+        except Exception as e:
+            utils.printred(f"JobsDB: Look-ahead prefetch failed: {type(e).__name__}: {str(e)}")
+            return
+        self.requested.update(str(job_id) for job_id in started)
+
+    def _collect(self, skip_ids: set) -> None:
+        if not self.requested:
+            return
+        try:
+            collected = self.driver.execute_script(DETAIL_COLLECT_SCRIPT, sorted(self.requested)) or {}
+        except Exception as e:
+            utils.printred(f"JobsDB: Look-ahead collect failed: {type(e).__name__}: {str(e)}")
+            return
+        self.requested.difference_update(str(job_id) for job_id in collected.get("done", []))
+        for job_info in collected.get("ready", []):
+            job_id = str(job_info["job_id"])
+            if job_id in self.attempted or job_id in skip_ids:
+                continue
+            self.attempted.add(job_id)
+            reason = self.precheck(job_info)
+            if reason:
+                continue  # would be rejected before scoring anyway, do not pay for it
+            self.pending[job_id] = self.executor.submit(self.score, job_info)
+            utils.printyellow(f"JobsDB: Scoring job {job_id} ahead: {job_info.get('title')}")
+
+    def reset(self) -> None:
+        """Cancel the scores not started yet and forget the current page"""
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        self.requested.clear()
+
+    def take(self, job_id: str, timeout: float = 120) -> Optional[dict]:
+        """The speculatively scored job_info for job_id (waits if still running), None when there is none"""
+        future = self.pending.pop(str(job_id), None)
+        if future is None:
+            self.misses += 1
+            return None
+        try:
+            result = future.result(timeout=timeout)
+        except Exception as e:
+            utils.printred(f"JobsDB: Look-ahead score for {job_id} failed: {type(e).__name__}: {str(e)}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def report(self) -> str:
+        summary = f"Look-ahead scoring: {self.hits} scores ready when needed, {self.misses} scored inline, {len(self.pending)} pending"
+        utils.printyellow(summary)
+        return summary
+
+    def close(self) -> None:
+        self.reset()
+        self.executor.shutdown(wait=False)
+
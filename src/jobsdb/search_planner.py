@@ -0,0 +1,51 @@
+from collections import deque
+from typing import List, Optional
+import src.utils.utils as utils
+
+
+class SearchPlanner:
+    """
+    Runs several JobsDB searches (one per position/location pair) as one interleaved stream of
+    result pages: page 1 of every query, then page 2 of every query, and so on. A query drops out
+    once it runs out of cards or stops turning up jobs the other queries have not already shown,
+    so an empty or exhausted search never holds up a productive one.
+
+    searches: [{"url": "https://hk.jobsdb.com/ai-engineer-jobs/in-Hong-Kong-SAR?daterange=7", "job_title": "ai-engineer-jobs"}]
+    """
+
+    def __init__(self, searches: List[dict], max_pages: int = 10, max_stale_pages: int = 2):
+        self.max_pages = max_pages
+        self.max_stale_pages = max_stale_pages
+        self.queue = deque({**search, "page": 0, "stale_pages": 0, "new_jobs": 0} for search in searches)
+        self.finished: List[dict] = []
+
+    @staticmethod
+    def page_url(url: str, page: int) -> str:
+        if page <= 1:
+            return url
+        return f"{url}{'&' if '?' in url else '?'}page={page}"
+
+    def next_page(self) -> Optional[dict]:
+        """The next query to fetch; its 'page' and 'page_url' point at the page to load"""
+        if not self.queue:
+            return None
+        search = self.queue.popleft()
+        search["page"] += 1
+        search["page_url"] = self.page_url(search["url"], search["page"])
+        return search
+
+    def record_page(self, search: dict, cards_found: int, new_jobs: int) -> None:
+        """Report what the page returned by next_page yielded; decides whether the query gets another turn"""
+        search["new_jobs"] += new_jobs
+        search["stale_pages"] = 0 if new_jobs else search["stale_pages"] + 1
+        if not cards_found:
+            reason = "no more cards"
+        elif search["page"] >= self.max_pages:
+            reason = "page limit"
+        elif search["stale_pages"] >= self.max_stale_pages:
+            reason = "only duplicates"
+        else:
+            self.queue.append(search)
+            return
+        utils.printyellow(f"JobsDB: Search {search['job_title']} finished after {search['page']} pages ({reason}), {search['new_jobs']} new jobs")
+        self.finished.append(search)
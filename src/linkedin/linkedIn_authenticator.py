@@ -1,30 +1,44 @@
-import time
+from typing import Dict
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from src.base.base_authenticator import BaseAuthenticator
 
-class LinkedInAuthenticator:
-    
-    def __init__(self, driver=None):
-        self.driver = driver
-        self.email = ""
-        self.password = ""
+class LinkedInAuthenticator(BaseAuthenticator):
 
-    def set_secrets(self, email, password):
-        self.email = email
-        self.password = password
+    def get_platform_urls(self):
+        return (
+            'https://www.linkedin.com',
+            'https://www.linkedin.com/login',
+            'https://www.linkedin.com/feed/'
+        )
 
-    def start(self):
-        print("Starting Chrome browser to log in to LinkedIn.")
-        self.driver.get('https://www.linkedin.com')
-        self.wait_for_page_load()
-        if not self.is_logged_in():
-            self.handle_login()
+    def get_login_selectors(self):
+        return {
+            'email_field': 'username',
+            'password_field': 'password',
+            'submit_button': '//button[@type="submit"]'
+        }
+
+    def get_logged_in_indicator(self):
+        return {
+            'selector': '.share-box-feed-entry__trigger',
+            'text': 'Start a post'
+        }
+
+    def get_login_outcomes(self) -> Dict[str, Dict]:
+        """What LinkedIn shows after the login form is submitted; replaces a fixed 35 second sleep"""
+        return {
+            'feed': {'url_contains': ['/feed'], 'timeout': 35},
+            'verification_code': {'selector': 'input[name="pin"], #input__email_verification_pin', 'timeout': 35},
+            'security_challenge': {'url_contains': ['/checkpoint/'], 'timeout': 35},
+            'error': {'selector': '#error-for-username, #error-for-password, .form__label--error', 'visible_text': True, 'timeout': 15},
+        }
 
     def handle_login(self):
         print("Navigating to the LinkedIn login page...")
-        self.driver.get("https://www.linkedin.com/login")
+        self.driver.get(self.login_url)
         if 'feed' in self.driver.current_url:
             print("User is already logged in.")
             return
@@ -33,7 +47,12 @@ class LinkedInAuthenticator:
             self.submit_login_form()
         except NoSuchElementException:
             print("Could not log in to LinkedIn. Please check your credentials.")
-        time.sleep(35) #TODO fix better
+        outcome = self.wait_for_login_outcome(self.get_login_outcomes())
+        if outcome == 'feed':
+            return
+        if outcome == 'error':
+            print("LinkedIn rejected the login. Please check your credentials.")
+            return
         self.handle_security_check()
 
     def enter_credentials(self):
@@ -80,11 +99,3 @@ class LinkedInAuthenticator:
         except TimeoutException:
             pass
         return False
-
-    def wait_for_page_load(self, timeout=10):
-        try:
-            WebDriverWait(self.driver, timeout).until(
-                lambda d: d.execute_script('return document.readyState') == 'complete'
-            )
-        except TimeoutException:
-            print("Page load timed out.")
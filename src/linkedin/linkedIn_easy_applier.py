@@ -6,6 +6,7 @@ import re
 import tempfile
 import time
 import traceback
+from collections import Counter
 from datetime import date
 from typing import List, Optional, Any, Tuple
 from reportlab.lib.pagesizes import letter
@@ -18,6 +19,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select, WebDriverWait
 from selenium.webdriver import ActionChains
 import src.utils.utils as utils
+from src.utils.adaptive_wait import adaptive_wait
 
 class LinkedInEasyApplier:
     def __init__(self, driver: Any, resume_dir: Optional[str], set_old_answers: List[Tuple[str, str, str]], gpt_answerer: Any, resume_generator_manager):
@@ -29,6 +31,9 @@ class LinkedInEasyApplier:
         self.gpt_answerer = gpt_answerer
         self.resume_generator_manager = resume_generator_manager
         self.all_data = self._load_questions_from_json()
+        # per modal step: question labels already answered, and how many answer calls were made per question
+        self.step_answered = set()
+        self.step_answer_counts = Counter()
 
     def _load_questions_from_json(self) -> List[dict]:
         output_file = 'answers.json'
@@ -106,9 +111,12 @@ class LinkedInEasyApplier:
 
     def _get_job_recruiter(self):
         try:
-            hiring_team_section = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, '//h2[text()="Meet the hiring team"]'))
+            # The hiring team is optional: once the job description is rendered, don't wait for it
+            hiring_team_section = adaptive_wait.find(
+                self.driver, "linkedin_job", '//h2[text()="Meet the hiring team"]', by=By.XPATH, signature="#job-details"
             )
+            if hiring_team_section is None:
+                return ""
             recruiter_element = hiring_team_section.find_element(By.XPATH, './/following::a[contains(@href, "linkedin.com/in/")]')
             recruiter_link = recruiter_element.get_attribute('href')
             return recruiter_link
@@ -163,16 +171,20 @@ class LinkedInEasyApplier:
             pass
 
     def fill_up(self, job) -> None:
+        # One pass per modal step: uploads are handled once for the whole step and every
+        # question section is answered once, no matter how many pb4 elements the step has.
         easy_apply_content = self.driver.find_element(By.CLASS_NAME, 'jobs-easy-apply-content')
         pb4_elements = easy_apply_content.find_elements(By.CLASS_NAME, 'pb4')
-        for element in pb4_elements:
-            self._process_form_element(element, job)
-        
-    def _process_form_element(self, element: WebElement, job) -> None:
-        if self._is_upload_field(element):
-            self._handle_upload_fields(element, job)
-        else:
+        self.step_answered = set()
+        self.step_answer_counts = Counter()
+        upload_elements = [element for element in pb4_elements if self._is_upload_field(element)]
+        if upload_elements:
+            self._handle_upload_fields(upload_elements[0], job)
+        if len(upload_elements) < len(pb4_elements):
             self._fill_additional_questions()
+        repeated = {question: count for question, count in self.step_answer_counts.items() if count > 1}
+        if repeated:
+            utils.printred(f"Questions answered more than once in this step: {repeated}")
 
     def _is_upload_field(self, element: WebElement) -> bool:
         return bool(element.find_elements(By.XPATH, ".//input[@type='file']"))
@@ -233,8 +245,25 @@ class LinkedInEasyApplier:
     def _fill_additional_questions(self) -> None:
         form_sections = self.driver.find_elements(By.CLASS_NAME, 'jobs-easy-apply-form-section__grouping')
         for section in form_sections:
+            question_key = self._question_label(section)
+            if question_key in self.step_answered:
+                continue
+            if question_key:
+                self.step_answered.add(question_key)
             self._process_form_section(section)
-            
+
+    def _question_label(self, section: WebElement) -> str:
+        # the question's own label: radio groups put it in a legend, other fields in the first label
+        for tag in ('legend', 'label'):
+            labels = section.find_elements(By.TAG_NAME, tag)
+            if labels and labels[0].text.strip():
+                return self._sanitize_text(labels[0].text)
+        lines = section.text.strip().splitlines()
+        return self._sanitize_text(lines[0]) if lines else ''
+
+    def _record_answer_call(self, question_text: str) -> None:
+        # counted where the answer is produced, so a question answered twice in a step shows up in fill_up's report
+        self.step_answer_counts[self._sanitize_text(question_text)] += 1
 
     def _process_form_section(self, section: WebElement) -> None:
         if self._handle_terms_of_service(section):
@@ -267,6 +296,7 @@ class LinkedInEasyApplier:
                     existing_answer = item
                     self._select_radio(radios, existing_answer['answer'])
                     return True
+            self._record_answer_call(question_text)
             answer = self.gpt_answerer.answer_question_from_options(question_text, options)
             self._save_questions_to_json({'type': 'radio', 'question': question_text, 'answer': answer})
             self._select_radio(radios, answer)
@@ -279,6 +309,7 @@ class LinkedInEasyApplier:
             text_field = text_fields[0]
             question_text = section.find_element(By.TAG_NAME, 'label').text.lower()
             is_numeric = self._is_numeric_field(text_field)
+            self._record_answer_call(question_text)
             if is_numeric:
                 question_type = 'numeric'
                 answer = self.gpt_answerer.answer_question_numeric(question_text)
@@ -301,6 +332,7 @@ class LinkedInEasyApplier:
         if date_fields:
             date_field = date_fields[0]
             question_text = section.text.lower()
+            self._record_answer_call(question_text)
             answer_date = self.gpt_answerer.answer_question_date()
             answer_text = answer_date.strftime("%Y-%m-%d")
 
@@ -330,6 +362,7 @@ class LinkedInEasyApplier:
                         existing_answer = item
                         self._select_dropdown_option(dropdown, existing_answer['answer'])
                         return True
+                self._record_answer_call(question_text)
                 answer = self.gpt_answerer.answer_question_from_options(question_text, options)
                 self._save_questions_to_json({'type': 'dropdown', 'question': question_text, 'answer': answer})
                 self._select_dropdown_option(dropdown, answer)
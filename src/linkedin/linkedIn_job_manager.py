@@ -9,6 +9,7 @@ from selenium.webdriver.common.by import By
 import src.utils.utils as utils
 from src.utils.job import Job
 from src.linkedin.linkedIn_easy_applier import LinkedInEasyApplier
+from src.logging.webdriver_profiler import profile_job
 import json
 
 
@@ -123,7 +124,8 @@ class LinkedInJobManager:
                 continue
             try:
                 if job.apply_method not in {"Continue", "Applied", "Apply"}:
-                    self.easy_applier_component.job_apply(job)
+                    with profile_job(self.driver, job.link.rstrip('/').split('/')[-1]):
+                        self.easy_applier_component.job_apply(job)
                     self.write_to_file(job, "success")
             except Exception as e:
                 utils.printred(traceback.format_exc())
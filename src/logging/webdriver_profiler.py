@@ -0,0 +1,173 @@
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+
+REPORT_PATH = "job_apply_logs/webdriver_profile"
+
+# Selenium frames whose public method name is reported as the command (find_element, get_attribute, click, ...)
+_COMMAND_MODULES = (
+    os.path.join("selenium", "webdriver", "remote", "webdriver.py"),
+    os.path.join("selenium", "webdriver", "remote", "webelement.py"),
+    os.path.join("selenium", "webdriver", "remote", "switch_to.py"),
+    os.path.join("selenium", "webdriver", "chromium", "webdriver.py"),
+)
+_SELENIUM_PACKAGE = os.sep + "selenium" + os.sep
+
+
+class WebDriverProfiler:
+    """
+    Opt-in profiler counting and timing every WebDriver command.
+
+    It wraps driver.execute on the driver instance. WebElement commands are sent through their
+    parent driver's execute, so element calls (click, get_attribute, send_keys, ...) are captured
+    without proxying elements, and WebDriverWait/ActionChains keep working with the real objects.
+    Each command is labelled with the public Selenium method that issued it and attributed to the
+    first calling method outside Selenium (e.g. sidebar_job_detail, capture_dropdown_problem).
+    """
+
+    def __init__(self, driver, report_path: str = REPORT_PATH):
+        self.driver = driver
+        self.report_path = report_path
+        self.run_started = datetime.now()
+        self.run_stats = self._new_stats()
+        self.job_stats = None
+        self.job_id = None
+        self.job_started = None
+        self._original_execute = None
+
+    @staticmethod
+    def _new_stats():
+        return defaultdict(lambda: {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+
+    def install(self) -> "WebDriverProfiler":
+        if self._original_execute is None:
+            self._original_execute = self.driver.execute
+            self.driver.execute = self._execute
+            self.driver.command_profiler = self
+        return self
+
+    def uninstall(self) -> None:
+        if self._original_execute is not None:
+            self.driver.execute = self._original_execute
+            self._original_execute = None
+            self.driver.command_profiler = None
+
+    def _execute(self, driver_command, params=None):
+        start = time.perf_counter()
+        try:
+            return self._original_execute(driver_command, params)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            command, caller = self._attribute(driver_command)
+            self._record(self.run_stats, command, caller, elapsed_ms)
+            if self.job_stats is not None:
+                self._record(self.job_stats, command, caller, elapsed_ms)
+
+    @staticmethod
+    def _attribute(driver_command: str):
+        """Return (selenium method name, calling method name) for the command being executed"""
+        command, caller = driver_command, "unknown"
+        frame = sys._getframe(2)  # skip _attribute and _execute
+        in_command_chain = True
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            name = frame.f_code.co_name
+            if _SELENIUM_PACKAGE in filename:
+                if in_command_chain and filename.endswith(_COMMAND_MODULES) and not name.startswith("_"):
+                    command = name
+                elif not filename.endswith(_COMMAND_MODULES):
+                    in_command_chain = False
+            elif filename != __file__ and not name.startswith("<"):
+                caller = name
+                break
+            frame = frame.f_back
+        return command, caller
+
+    @staticmethod
+    def _record(stats, command: str, caller: str, elapsed_ms: float) -> None:
+        entry = stats[(command, caller)]
+        entry["count"] += 1
+        entry["total_ms"] += elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+
+    def begin_job(self, job_id: str) -> None:
+        self.job_id = job_id
+        self.job_started = time.perf_counter()
+        self.job_stats = self._new_stats()
+
+    def end_job(self) -> Optional[str]:
+        if self.job_stats is None:
+            return None
+        report = self._build_report(self.job_stats)
+        report["job_id"] = self.job_id
+        report["wall_ms"] = round((time.perf_counter() - self.job_started) * 1000, 1)
+        path = self._write(f"job_{self.job_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json", report)
+        self.job_stats, self.job_id = None, None
+        return path
+
+    def write_run_report(self) -> str:
+        report = self._build_report(self.run_stats)
+        report["run_started"] = self.run_started.strftime("%Y-%m-%d %H:%M:%S")
+        path = self._write(f"run_{self.run_started.strftime('%Y%m%d_%H%M%S')}.json", report)
+        print(f"WebDriver profile: {report['total_commands']} commands, "
+              f"{report['total_ms']:.0f} ms in WebDriver, report written to {path}")
+        return path
+
+    @staticmethod
+    def _build_report(stats) -> dict:
+        by_command = defaultdict(lambda: {"count": 0, "total_ms": 0.0})
+        by_caller = defaultdict(lambda: {"count": 0, "total_ms": 0.0})
+        entries = []
+        for (command, caller), entry in stats.items():
+            for bucket in (by_command[command], by_caller[caller]):
+                bucket["count"] += entry["count"]
+                bucket["total_ms"] += entry["total_ms"]
+            entries.append({
+                "command": command,
+                "caller": caller,
+                "count": entry["count"],
+                "total_ms": round(entry["total_ms"], 1),
+                "avg_ms": round(entry["total_ms"] / entry["count"], 1),
+                "max_ms": round(entry["max_ms"], 1),
+            })
+
+        def ranked(buckets):
+            return dict(sorted(
+                ((key, {"count": value["count"], "total_ms": round(value["total_ms"], 1)}) for key, value in buckets.items()),
+                key=lambda item: item[1]["total_ms"],
+                reverse=True,
+            ))
+
+        return {
+            "total_commands": sum(entry["count"] for entry in entries),
+            "total_ms": round(sum(entry["total_ms"] for entry in entries), 1),
+            "by_command": ranked(by_command),
+            "by_caller": ranked(by_caller),
+            "entries": sorted(entries, key=lambda entry: entry["total_ms"], reverse=True),
+        }
+
+    def _write(self, file_name: str, report: dict) -> str:
+        os.makedirs(self.report_path, exist_ok=True)
+        path = os.path.join(self.report_path, file_name)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return path
+
+
+@contextmanager
+def profile_job(driver, job_id: str):
+    """Attribute the enclosed WebDriver commands to job_id; a no-op when profiling is off"""
+    profiler: Optional[WebDriverProfiler] = getattr(driver, "command_profiler", None)
+    if profiler is None:
+        yield
+        return
+    profiler.begin_job(job_id)
+    try:
+        yield
+    finally:
+        profiler.end_job()
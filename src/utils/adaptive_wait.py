@@ -0,0 +1,113 @@
+import json
+import math
+import os
+import threading
+import time
+from typing import Optional
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+STORE_PATH = r"./env/adaptive_waits.json"
+
+
+class AdaptiveWait:
+    """
+    Waits whose timeout is learned from how long each (page type, selector) actually took to appear.
+
+    Every wait starts with an instant existence check. When the page's own signature is already
+    rendered but the element is not, the element is taken as absent right away. Otherwise the wait
+    uses the p99 of the latencies observed on earlier waits times a margin, or default_timeout
+    until enough samples exist.
+    Latencies are kept per key in env/adaptive_waits.json, so the timeouts carry across runs.
+    """
+
+    def __init__(self, store_path: str = STORE_PATH, default_timeout: float = 10, min_timeout: float = 1.0,
+                 margin: float = 1.5, min_samples: int = 5, max_samples: int = 200):
+        self.store_path = store_path
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.margin = margin
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self.samples = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.store_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.store_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.store_path, "w", encoding="utf-8") as f:
+            json.dump(self.samples, f, indent=2)
+
+    @staticmethod
+    def _key(page_type: str, by: str, selector: str) -> str:
+        return f"{page_type}|{by}|{selector}"
+
+    def timeout_for(self, page_type: str, by: str, selector: str, ceiling: Optional[float] = None) -> float:
+        """Learned p99 latency times margin, clamped to [min_timeout, ceiling]"""
+        ceiling = ceiling or self.default_timeout
+        latencies = sorted(self.samples.get(self._key(page_type, by, selector), []))
+        if len(latencies) < self.min_samples:
+            return ceiling
+        p99 = latencies[min(len(latencies) - 1, math.ceil(0.99 * len(latencies)) - 1)]
+        return max(self.min_timeout, min(ceiling, p99 * self.margin))
+
+    def record(self, page_type: str, by: str, selector: str, seconds: float) -> None:
+        with self._lock:
+            latencies = self.samples.setdefault(self._key(page_type, by, selector), [])
+            latencies.append(round(seconds, 3))
+            del latencies[:-self.max_samples]
+            self._save()
+
+    def find(self, driver, page_type: str, selector: str, by: str = By.CSS_SELECTOR, visible: bool = False,
+             signature: Optional[str] = None, root=None, ceiling: Optional[float] = None):
+        """
+        Return the element, or None when it is absent.
+
+        signature: CSS selector of something every loaded page of this type has. Once it is
+        there, a missing element is a legitimate absence and no time is spent waiting for it.
+        root: element to search in instead of the whole page.
+        """
+        root = root or driver
+        start = time.perf_counter()
+
+        element = self._present(root, by, selector, visible)
+        if element is not None:
+            return element  # instant hits say nothing about how long a real wait takes
+        if signature and driver.find_elements(By.CSS_SELECTOR, signature):
+            return None
+
+        timeout = self.timeout_for(page_type, by, selector, ceiling)
+        try:
+            element = WebDriverWait(driver, timeout, poll_frequency=0.2).until(
+                lambda d: self._present(root, by, selector, visible) or False
+            )
+        except TimeoutException:
+            if timeout < (ceiling or self.default_timeout):
+                # a learned timeout that ran out may have been too short: count it, so the p99 grows
+                self.record(page_type, by, selector, timeout)
+            return None
+        self.record(page_type, by, selector, time.perf_counter() - start)
+        return element
+
+    @staticmethod
+    def _present(root, by: str, selector: str, visible: bool):
+        try:
+            for element in root.find_elements(by, selector):
+                if not visible or element.is_displayed():
+                    return element
+        except Exception:
+            pass
+        return None
+
+
+adaptive_wait = AdaptiveWait()
@@ -0,0 +1,106 @@
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from typing import List, Optional
+
+CACHE_PATH = r"./env/answer_cache.json"
+
+
+def _normalize(text) -> str:
+    return " ".join(str(text or "").split()).lower()
+
+
+class AnswerCache:
+    """
+    Persistent cache of questionnaire answers, so a question employers keep asking
+    ("expected salary", "right to work in HK", ...) is answered once per profile.
+
+    The key is the normalized question plus its normalized option texts, never the A/B/C letters:
+    the same options in another order on another form hit the same entry, and the cached choice is
+    stored as option text and mapped back onto the letters of the current form. The whole cache is
+    dropped when the profile YAML it was answered from changes (profile_hash).
+
+    Stored structure: {
+        "profile_hash": "<sha256 of the profile yaml>",
+        "answers": {"<key>": {"question": "...", "choices": ["Yes"], "saved_at": "2024-01-01 10:00:00"}}
+    }
+    Free-text questions (no options) store the raw answer list in "answer" instead of "choices".
+    """
+
+    def __init__(self, profile_hash: Optional[str], cache_path: str = CACHE_PATH):
+        self.cache_path = cache_path
+        self.profile_hash = profile_hash
+        self._lock = threading.Lock()
+        self.answers = self._load()
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self) -> dict:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if not isinstance(data, dict) or data.get("profile_hash") != self.profile_hash:
+            print("Answer cache was built from another profile version, starting empty.")
+            return {}
+        return data.get("answers", {})
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            json.dump({"profile_hash": self.profile_hash, "answers": self.answers}, f, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def _split(question):
+        """Questions come as plain text or as {"Question": text, "options": {"A": text, ...}}"""
+        if isinstance(question, dict):
+            return question.get("Question", ""), question.get("options") or {}
+        return question, {}
+
+    def key(self, question) -> str:
+        text, options = self._split(question)
+        return " || ".join([_normalize(text)] + sorted(_normalize(option) for option in options.values()))
+
+    def get(self, question) -> Optional[List[str]]:
+        """The cached answer in the shape the answering chain returns (e.g. ["B"]), None on a miss"""
+        _, options = self._split(question)
+        entry = self.answers.get(self.key(question))
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if not options:
+            self.hits += 1
+            return list(entry.get("answer", []))
+
+        letters = {_normalize(option): letter for letter, option in options.items()}
+        mapped = [letters.get(_normalize(choice)) for choice in entry.get("choices", [])]
+        if not mapped or None in mapped:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return mapped
+
+    def put(self, question, answer: List[str]) -> None:
+        text, options = self._split(question)
+        entry = {"question": text, "saved_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+        if options:
+            choices = []
+            for raw in answer:
+                for letter in re.findall(r"\b[A-Z]\b", str(raw).strip().upper()):
+                    if letter in options and options[letter] not in choices:
+                        choices.append(options[letter])
+            if not choices:
+                return  # the answer did not name an option, nothing reliable to reuse
+            entry["choices"] = choices
+        else:
+            entry["answer"] = [str(part) for part in answer]
+
+        with self._lock:
+            self.answers[self.key(question)] = entry
+            self._save()
@@ -0,0 +1,47 @@
+from typing import Dict
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
+import src.utils.strings as strings
+
+# Prompts in strings.py that are not named *_template
+_EXTRA_TEMPLATE_NAMES = ("job_info", "document_selection")
+
+
+def strings_templates() -> Dict[str, str]:
+    """Every prompt template defined in src/utils/strings.py, by variable name"""
+    return {
+        name: value for name, value in vars(strings).items()
+        if isinstance(value, str) and (name.endswith("_template") or name in _EXTRA_TEMPLATE_NAMES)
+    }
+
+
+class ChainRegistry:
+    """
+    Compiles prompt | llm | StrOutputParser once per template and hands out the shared runnable.
+    Runnables are stateless, so one instance serves every question and every job.
+    """
+
+    def __init__(self, llm, templates: Dict[str, str]):
+        self.llm = llm
+        self._chains: Dict[str, Runnable] = {}
+        for name, template in templates.items():
+            self.register(name, template)
+
+    def register(self, name: str, template: str, llm=None) -> Runnable:
+        """llm overrides the registry's model for this chain, e.g. a LoggerChatModel to record its calls"""
+        chain = ChatPromptTemplate.from_template(template) | (llm or self.llm) | StrOutputParser()
+        self._chains[name] = chain
+        return chain
+
+    def get(self, name: str) -> Runnable:
+        chain = self._chains.get(name)
+        if chain is None:
+            raise ValueError(f"Chain not defined for template '{name}'")
+        return chain
+
+    def __getitem__(self, name: str) -> Runnable:
+        return self.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._chains
@@ -0,0 +1,164 @@
+import hashlib
+import re
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+DEFAULT_TOKEN_BUDGET = 800
+
+# section title -> usefulness for judging fit; first match wins, unmatched titled sections score 1.5
+SECTION_PRIORITIES = [
+    (re.compile(r"requirement|qualification|skill|experience|what you (?:need|bring|have)|who you are|about you|must have|"
+                r"nice to have|preferred|要求|資格|资格|條件|条件|技能"), 3.0),
+    (re.compile(r"responsibilit|dut(?:y|ies)|what you(?:'ll| will) do|the role|your role|job description|role description|"
+                r"key task|scope|職責|职责|工作內容|工作内容|職位描述|职位描述"), 2.5),
+    (re.compile(r"^intro\d*$"), 1.0),
+    (re.compile(r"about (?:us|the company|the team)|who we are|company|our (?:story|mission|culture)|公司|關於我們|关于我们"), 0.5),
+    (re.compile(r"benefit|perk|what we offer|we offer|package|welfare|remuneration|福利|待遇"), 0.3),
+    (re.compile(r"how to apply|application (?:method|process)|apply now|personal data|privacy|equal opportunit|申請方法|申请方法|個人資料|个人资料"), 0.0),
+    (re.compile(r"tech|stack|tools?\b|environment|project"), 2.0),
+]
+# lines that say nothing about the job itself
+BOILERPLATE_LINES = re.compile(
+    r"personal data|privacy (?:policy|statement)|equal opportunit|only shortlisted|shortlisted candidates will be|"
+    r"will be used for recruitment|apply (?:now|today)|click (?:the )?apply|send (?:your|full) (?:cv|resume)|interested parties|"
+    r"個人資料|个人资料|只有.*入選|只有.*入选|有意者|請.*申請|请.*申请",
+    re.IGNORECASE,
+)
+
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """Tokens by tiktoken's cl100k_base when it is installed, otherwise a close local estimate (4 chars/token, 1 per CJK char)"""
+    global _encoding
+    if tiktoken is not None and _encoding is None:
+        try:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = False  # encoding file not cached and no network, use the estimate
+    if _encoding:
+        return len(_encoding.encode(text))
+    return sum(len(piece) if re.match(r"[㐀-鿿]", piece) else max(1, -(-len(piece) // 4))
+               for piece in re.findall(r"[㐀-鿿]+|\w+|[^\w\s]", text))
+
+
+def truncate_to_tokens(text: str, limit: int) -> str:
+    """
+    Longest prefix of text within limit tokens: whole sentences while they fit, then the next sentence
+    cut at a word (a character for CJK). Single-paragraph descriptions are common, so a line over the
+    budget is shortened, never dropped.
+    """
+    if limit <= 0:
+        return ""
+    if count_tokens(text) <= limit:
+        return text
+    kept = ""
+    for sentence in re.split(r"(?<=[.!?;。！？；])\s+", text):
+        candidate = f"{kept} {sentence}".strip()
+        if count_tokens(candidate) > limit:
+            break
+        kept = candidate
+    pieces = re.findall(r"[㐀-鿿]|\S+\s*", text[len(kept):].strip()) if kept else re.findall(r"[㐀-鿿]|\S+\s*", text)
+    low, high = 0, len(pieces)
+    while low < high:  # largest number of pieces that still fits next to the whole sentences
+        middle = (low + high + 1) // 2
+        if count_tokens(f"{kept} {''.join(pieces[:middle])}".strip()) <= limit:
+            low = middle
+        else:
+            high = middle - 1
+    return f"{kept} {''.join(pieces[:low])}".strip()
+
+
+def section_priority(title: str) -> float:
+    title = title.strip().lower()
+    for pattern, priority in SECTION_PRIORITIES:
+        if pattern.search(title):
+            return priority
+    return 1.5
+
+
+class DescriptionCompactor:
+    """
+    Shrinks the sections of a JobsDB description (sidebar_job_detail: {"Intro1": ..., "Requirements": ...})
+    to a token budget before it is sent to the LLM. Boilerplate lines (privacy notes, "apply now") and lines
+    repeated across sections are dropped. Sections are then kept by usefulness (requirements and
+    responsibilities before company blurb and benefits), the last one cut to fit (whole lines, then
+    sentences, then words), and the kept sections are written out in their original order. A non-empty
+    description never compacts to an empty string. Results are memoized per description, since
+    the same job is scored and parsed.
+    """
+
+    def __init__(self, token_budget: int = DEFAULT_TOKEN_BUDGET):
+        self.token_budget = token_budget
+        self._compacted: Dict[str, Tuple[str, dict]] = {}
+
+    def compact(self, sections, token_budget: Optional[int] = None) -> Tuple[str, dict]:
+        """Returns (text, stats) with stats {"tokens_before", "tokens_after", "sections_kept", "sections_dropped"}"""
+        if not isinstance(sections, dict):
+            sections = {"Intro1": str(sections or "")}
+        budget = token_budget or self.token_budget
+        key = hashlib.sha256(repr((budget, sorted(sections.items()))).encode("utf-8")).hexdigest()
+        if key not in self._compacted:
+            if len(self._compacted) > 256:
+                self._compacted.clear()
+            self._compacted[key] = self._compact(sections, budget)
+        return self._compacted[key]
+
+    def _compact(self, sections: Dict[str, str], budget: int) -> Tuple[str, dict]:
+        tokens_before = count_tokens("\n\n".join(f"{title}:\n{text}" for title, text in sections.items()))
+
+        seen_lines = set()
+        cleaned: List[Tuple[int, str, List[str]]] = []
+        for order, (title, text) in enumerate(sections.items()):
+            lines = []
+            for line in str(text or "").splitlines():
+                normalized = " ".join(line.split()).lower()
+                if not normalized or normalized in seen_lines or BOILERPLATE_LINES.search(normalized):
+                    continue
+                seen_lines.add(normalized)
+                lines.append(line.strip())
+            if lines:
+                cleaned.append((order, title, lines))
+
+        ranked = sorted(cleaned, key=lambda section: -section_priority(section[1]))  # stable: ties keep page order
+        kept, used = {}, 0
+        for order, title, lines in ranked:
+            if section_priority(title) <= 0:
+                continue
+            block = []
+            cost = count_tokens(f"{title}:\n")
+            for line in lines:
+                line_cost = count_tokens(line) + 1
+                if used + cost + line_cost > budget:
+                    # the line that overflows is cut to what is left, a long paragraph still says something
+                    line = truncate_to_tokens(line, budget - used - cost - 1)
+                    if line:
+                        block.append(line)
+                        cost += count_tokens(line) + 1
+                    break
+                block.append(line)
+                cost += line_cost
+            if block:
+                kept[order] = f"{title}:\n" + "\n".join(block)
+                used += cost
+            if used >= budget:
+                break
+
+        text = "\n\n".join(kept[order] for order in sorted(kept))
+        if not text:
+            # everything was boilerplate or low-value: a cut of the raw text beats an empty description
+            raw = "\n".join(str(value or "").strip() for value in sections.values() if str(value or "").strip())
+            text = truncate_to_tokens(raw, budget)
+        stats = {
+            "tokens_before": tokens_before,
+            "tokens_after": count_tokens(text),
+            "sections_kept": len(kept),
+            "sections_dropped": len(sections) - len(kept),
+        }
+        print(f"Description compacted: {stats['tokens_before']} -> {stats['tokens_after']} tokens "
+              f"({stats['sections_kept']} sections kept, {stats['sections_dropped']} dropped, budget {budget})")
+        return text, stats
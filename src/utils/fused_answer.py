@@ -0,0 +1,41 @@
+import json
+import re
+from typing import Dict, Iterable, Optional, Tuple
+
+
+def render_profile_sections(sources: Iterable, sections: Iterable[str]) -> str:
+    """Compact text of every answerable section, taken from the first source object that has it"""
+    parts = []
+    for section in sections:
+        value = next((getattr(source, section) for source in sources if getattr(source, section, None) is not None), None)
+        if value is not None:
+            parts.append(f"### {section}\n{value}")
+    return "\n\n".join(parts)
+
+
+def parse_fused_answer(output: str) -> Optional[Tuple[str, str]]:
+    """(section, answer) from the model's JSON reply, None when it is not usable"""
+    match = re.search(r"\{.*\}", output or "", re.DOTALL)
+    if not match:
+        return None
+    try:
+        data = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(data, dict) or not str(data.get("answer", "")).strip():
+        return None
+    return str(data.get("section", "")).strip().lower().replace(" ", "_"), str(data["answer"]).strip()
+
+
+def parse_batch_answers(output: str) -> Dict[str, str]:
+    """{question id: answer} from the model's JSON reply to a whole-form request, empty when unusable"""
+    match = re.search(r"\{.*\}", output or "", re.DOTALL)
+    if not match:
+        return {}
+    try:
+        data = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {str(key): str(value).strip() for key, value in data.items() if str(value).strip()}
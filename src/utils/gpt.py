@@ -7,16 +7,124 @@ from typing import Dict, List
 from pathlib import Path
 from dotenv import load_dotenv
 from langchain_core.messages.ai import AIMessage
-from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompt_values import StringPromptValue
-from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 from Levenshtein import distance
 
-import src.utils.strings as strings
+from src.utils.chain_registry import ChainRegistry, strings_templates
+from src.utils.fused_answer import parse_fused_answer, render_profile_sections
+from src.utils.section_classifier import LocalSectionRouter
 
 load_dotenv()
 
+# resume section -> strings.py template answering from it
+WIDE_RANGE_SECTION_TEMPLATES = {
+    "personal_information": "personal_information_template",
+    "self_identification": "self_identification_template",
+    "legal_authorization": "legal_authorization_template",
+    "work_preferences": "work_preferences_template",
+    "education_details": "education_details_template",
+    "experience_details": "experience_details_template",
+    "projects": "projects_template",
+    "availability": "availability_template",
+    "salary_expectations": "salary_expectations_template",
+    "certifications": "certifications_template",
+    "languages": "languages_template",
+    "interests": "interests_template",
+}
+
+# templates sent without their source indentation
+DEDENTED_TEMPLATES = ("summarize_prompt_template", "numeric_question_template", "options_template")
+
+SECTION_PROMPT = """
+        You are assisting a bot designed to automatically apply for jobs on LinkedIn. The bot receives various questions about job applications and needs to determine the most relevant section of the resume to provide an accurate response.
+
+        For the following question: '{question}', determine which section of the resume is most relevant. 
+        Respond with exactly one of the following options:
+        - Personal information
+        - Self Identification
+        - Legal Authorization
+        - Work Preferences
+        - Education Details
+        - Experience Details
+        - Projects
+        - Availability
+        - Salary Expectations
+        - Certifications
+        - Languages
+        - Interests
+
+        Here are detailed guidelines to help you choose the correct section:
+
+        1. **Personal Information**:
+        - **Purpose**: Contains your basic contact details and online profiles.
+        - **Use When**: The question is about how to contact you or requests links to your professional online presence.
+        - **Examples**: Email address, phone number, LinkedIn profile, GitHub repository, personal website.
+
+        2. **Self Identification**:
+        - **Purpose**: Covers personal identifiers and demographic information.
+        - **Use When**: The question pertains to your gender, pronouns, veteran status, disability status, or ethnicity.
+        - **Examples**: Gender, pronouns, veteran status, disability status, ethnicity.
+
+        3. **Legal Authorization**:
+        - **Purpose**: Details your work authorization status and visa requirements.
+        - **Use When**: The question asks about your ability to work in specific countries or if you need sponsorship or visas.
+        - **Examples**: Work authorization in EU and US, visa requirements, legally allowed to work.
+
+        4. **Work Preferences**:
+        - **Purpose**: Specifies your preferences regarding work conditions and job roles.
+        - **Use When**: The question is about your preferences for remote work, in-person work, relocation, and willingness to undergo assessments or background checks.
+        - **Examples**: Remote work, in-person work, open to relocation, willingness to complete assessments.
+
+        5. **Education Details**:
+        - **Purpose**: Contains information about your academic qualifications.
+        - **Use When**: The question concerns your degrees, universities attended, GPA, and relevant coursework.
+        - **Examples**: Degree, university, GPA, field of study, exams.
+
+        6. **Experience Details**:
+        - **Purpose**: Details your professional work history and key responsibilities.
+        - **Use When**: The question pertains to your job roles, responsibilities, and achievements in previous positions.
+        - **Examples**: Job positions, company names, key responsibilities, skills acquired.
+
+        7. **Projects**:
+        - **Purpose**: Highlights specific projects you have worked on.
+        - **Use When**: The question asks about particular projects, their descriptions, or links to project repositories.
+        - **Examples**: Project names, descriptions, links to project repositories.
+
+        8. **Availability**:
+        - **Purpose**: Provides information on your availability for new roles.
+        - **Use When**: The question is about how soon you can start a new job or your notice period.
+        - **Examples**: Notice period, availability to start.
+
+        9. **Salary Expectations**:
+        - **Purpose**: Covers your expected salary range.
+        - **Use When**: The question pertains to your salary expectations or compensation requirements.
+        - **Examples**: Desired salary range.
+
+        10. **Certifications**:
+            - **Purpose**: Lists your professional certifications or licenses.
+            - **Use When**: The question involves your certifications or qualifications from recognized organizations.
+            - **Examples**: Certification names, issuing bodies, dates of validity.
+
+        11. **Languages**:
+            - **Purpose**: Describes the languages you can speak and your proficiency levels.
+            - **Use When**: The question asks about your language skills or proficiency in specific languages.
+            - **Examples**: Languages spoken, proficiency levels.
+
+        12. **Interests**:
+            - **Purpose**: Details your personal or professional interests.
+            - **Use When**: The question is about your hobbies, interests, or activities outside of work.
+            - **Examples**: Personal hobbies, professional interests.
+
+        Provide only the exact name of the section from the list above with no additional text.
+        """
+
+RESUME_OR_COVER_PROMPT = """
+        Given the following phrase, respond with only 'resume' if the phrase is about a resume, or 'cover' if it's about a cover letter. Do not provide any additional information or explanations.
+        
+        phrase: {phrase}
+        """
+
 
 class LLMLogger:
     
@@ -26,6 +134,7 @@ class LLMLogger:
     @staticmethod
     def log_request(prompts, parsed_reply: Dict[str, Dict]):
         calls_log = os.path.join(Path("data_folder/output"), "open_ai_calls.json")
+        os.makedirs(os.path.dirname(calls_log), exist_ok=True)
         if isinstance(prompts, StringPromptValue):
             prompts = prompts.text
         elif isinstance(prompts, Dict):
@@ -113,10 +222,18 @@ class LoggerChatModel:
 
 
 class GPTAnswerer:
-    def __init__(self, openai_api_key):
+    def __init__(self, openai_api_key, answer_mode: str = "two_step"):
         self.llm_cheap = LoggerChatModel(
             ChatOpenAI(model="gpt-4o-mini", api_key=openai_api_key, temperature=0.4)
         )
+        # every prompt compiled once, shared by all questions and jobs
+        templates = strings_templates()
+        templates.update({name: self._preprocess_template_string(templates[name]) for name in DEDENTED_TEMPLATES})
+        templates.update({"section_router": SECTION_PROMPT, "resume_or_cover": RESUME_OR_COVER_PROMPT})
+        self.chains = ChainRegistry(self.llm_cheap, templates)
+        self.local_router = LocalSectionRouter("resume")
+        # "two_step": route to a section, then answer from it; "fused": one call doing both (ANSWER_MODE)
+        self.answer_mode = answer_mode
     @property
     def job_description(self):
         return self.job.description
@@ -150,137 +267,42 @@ class GPTAnswerer:
         self.job_application_profile = job_application_profile
         
     def summarize_job_description(self, text: str) -> str:
-        strings.summarize_prompt_template = self._preprocess_template_string(
-            strings.summarize_prompt_template
-        )
-        prompt = ChatPromptTemplate.from_template(strings.summarize_prompt_template)
-        chain = prompt | self.llm_cheap | StrOutputParser()
-        output = chain.invoke({"text": text})
+        output = self.chains["summarize_prompt_template"].invoke({"text": text})
         return output
             
-    def _create_chain(self, template: str):
-        prompt = ChatPromptTemplate.from_template(template)
-        return prompt | self.llm_cheap | StrOutputParser()
-    
     def answer_question_textual_wide_range(self, question: str) -> str:
-        # Define chains for each section of the resume
-        chains = {
-            "personal_information": self._create_chain(strings.personal_information_template),
-            "self_identification": self._create_chain(strings.self_identification_template),
-            "legal_authorization": self._create_chain(strings.legal_authorization_template),
-            "work_preferences": self._create_chain(strings.work_preferences_template),
-            "education_details": self._create_chain(strings.education_details_template),
-            "experience_details": self._create_chain(strings.experience_details_template),
-            "projects": self._create_chain(strings.projects_template),
-            "availability": self._create_chain(strings.availability_template),
-            "salary_expectations": self._create_chain(strings.salary_expectations_template),
-            "certifications": self._create_chain(strings.certifications_template),
-            "languages": self._create_chain(strings.languages_template),
-            "interests": self._create_chain(strings.interests_template),
-        }
-        section_prompt = """
-        You are assisting a bot designed to automatically apply for jobs on LinkedIn. The bot receives various questions about job applications and needs to determine the most relevant section of the resume to provide an accurate response.
-
-        For the following question: '{question}', determine which section of the resume is most relevant. 
-        Respond with exactly one of the following options:
-        - Personal information
-        - Self Identification
-        - Legal Authorization
-        - Work Preferences
-        - Education Details
-        - Experience Details
-        - Projects
-        - Availability
-        - Salary Expectations
-        - Certifications
-        - Languages
-        - Interests
-
-        Here are detailed guidelines to help you choose the correct section:
-
-        1. **Personal Information**:
-        - **Purpose**: Contains your basic contact details and online profiles.
-        - **Use When**: The question is about how to contact you or requests links to your professional online presence.
-        - **Examples**: Email address, phone number, LinkedIn profile, GitHub repository, personal website.
-
-        2. **Self Identification**:
-        - **Purpose**: Covers personal identifiers and demographic information.
-        - **Use When**: The question pertains to your gender, pronouns, veteran status, disability status, or ethnicity.
-        - **Examples**: Gender, pronouns, veteran status, disability status, ethnicity.
-
-        3. **Legal Authorization**:
-        - **Purpose**: Details your work authorization status and visa requirements.
-        - **Use When**: The question asks about your ability to work in specific countries or if you need sponsorship or visas.
-        - **Examples**: Work authorization in EU and US, visa requirements, legally allowed to work.
-
-        4. **Work Preferences**:
-        - **Purpose**: Specifies your preferences regarding work conditions and job roles.
-        - **Use When**: The question is about your preferences for remote work, in-person work, relocation, and willingness to undergo assessments or background checks.
-        - **Examples**: Remote work, in-person work, open to relocation, willingness to complete assessments.
-
-        5. **Education Details**:
-        - **Purpose**: Contains information about your academic qualifications.
-        - **Use When**: The question concerns your degrees, universities attended, GPA, and relevant coursework.
-        - **Examples**: Degree, university, GPA, field of study, exams.
-
-        6. **Experience Details**:
-        - **Purpose**: Details your professional work history and key responsibilities.
-        - **Use When**: The question pertains to your job roles, responsibilities, and achievements in previous positions.
-        - **Examples**: Job positions, company names, key responsibilities, skills acquired.
-
-        7. **Projects**:
-        - **Purpose**: Highlights specific projects you have worked on.
-        - **Use When**: The question asks about particular projects, their descriptions, or links to project repositories.
-        - **Examples**: Project names, descriptions, links to project repositories.
-
-        8. **Availability**:
-        - **Purpose**: Provides information on your availability for new roles.
-        - **Use When**: The question is about how soon you can start a new job or your notice period.
-        - **Examples**: Notice period, availability to start.
-
-        9. **Salary Expectations**:
-        - **Purpose**: Covers your expected salary range.
-        - **Use When**: The question pertains to your salary expectations or compensation requirements.
-        - **Examples**: Desired salary range.
-
-        10. **Certifications**:
-            - **Purpose**: Lists your professional certifications or licenses.
-            - **Use When**: The question involves your certifications or qualifications from recognized organizations.
-            - **Examples**: Certification names, issuing bodies, dates of validity.
-
-        11. **Languages**:
-            - **Purpose**: Describes the languages you can speak and your proficiency levels.
-            - **Use When**: The question asks about your language skills or proficiency in specific languages.
-            - **Examples**: Languages spoken, proficiency levels.
-
-        12. **Interests**:
-            - **Purpose**: Details your personal or professional interests.
-            - **Use When**: The question is about your hobbies, interests, or activities outside of work.
-            - **Examples**: Personal hobbies, professional interests.
-
-        Provide only the exact name of the section from the list above with no additional text.
-        """
-        prompt = ChatPromptTemplate.from_template(section_prompt)
-        chain = prompt | self.llm_cheap | StrOutputParser()
-        output = chain.invoke({"question": question})
+        if self.answer_mode == "fused":
+            result = self.fused_answer(question)
+            if result is not None:
+                return result[1]
+        output = self.local_router.route(question) or self.chains["section_router"].invoke({"question": question})
         section_name = output.lower().replace(" ", "_")
         if section_name == "cover_letter":
-            chain = chains.get(section_name)
-            output = chain.invoke({"resume": self.resume, "job_description": self.job_description})
+            output = self.chains["coverletter_template"].invoke({"resume": self.resume, "job_description": self.job_description})
             return output
         resume_section = getattr(self.resume, section_name, None) or getattr(self.job_application_profile, section_name, None)
         if resume_section is None:
             raise ValueError(f"Section '{section_name}' not found in either resume or job_application_profile.")
-        chain = chains.get(section_name)
-        if chain is None:
+        template_name = WIDE_RANGE_SECTION_TEMPLATES.get(section_name)
+        if template_name is None:
             raise ValueError(f"Chain not defined for section '{section_name}'")
-        return chain.invoke({"resume_section": resume_section, "question": question})
+        return self.chains[template_name].invoke({"resume_section": resume_section, "question": question})
+
+    def fused_answer(self, question: str):
+        """One LLM call choosing the section and answering; returns (section, answer) or None if the reply is unusable"""
+        sources = [source for source in (getattr(self, "resume", None), getattr(self, "job_application_profile", None)) if source is not None]
+        output = self.chains["fused_profile_answer_template"].invoke({
+            "sections": ", ".join(WIDE_RANGE_SECTION_TEMPLATES),
+            "profile": render_profile_sections(sources, WIDE_RANGE_SECTION_TEMPLATES),
+            "question": question,
+        })
+        parsed = parse_fused_answer(output)
+        if parsed is None:
+            print(f"Fused answer not parseable, falling back to two-step: {output}")
+        return parsed
 
     def answer_question_numeric(self, question: str, default_experience: int = 3) -> int:
-        func_template = self._preprocess_template_string(strings.numeric_question_template)
-        prompt = ChatPromptTemplate.from_template(func_template)
-        chain = prompt | self.llm_cheap | StrOutputParser()
-        output_str = chain.invoke({"resume_educations": self.resume.education_details,"resume_jobs": self.resume.experience_details,"resume_projects": self.resume.projects , "question": question})
+        output_str = self.chains["numeric_question_template"].invoke({"resume_educations": self.resume.education_details,"resume_jobs": self.resume.experience_details,"resume_projects": self.resume.projects , "question": question})
         try:
             output = self.extract_number_from_string(output_str)
         except ValueError:
@@ -295,23 +317,12 @@ class GPTAnswerer:
             raise ValueError("No numbers found in the string")
 
     def answer_question_from_options(self, question: str, options: list[str]) -> str:
-        func_template = self._preprocess_template_string(strings.options_template)
-        prompt = ChatPromptTemplate.from_template(func_template)
-        chain = prompt | self.llm_cheap | StrOutputParser()
-        output_str = chain.invoke({"resume": self.resume, "question": question, "options": options})
+        output_str = self.chains["options_template"].invoke({"resume": self.resume, "question": question, "options": options})
         best_option = self.find_best_match(output_str, options)
         return best_option
     
     def resume_or_cover(self, phrase: str) -> str:
-        # Define the prompt template
-        prompt_template = """
-        Given the following phrase, respond with only 'resume' if the phrase is about a resume, or 'cover' if it's about a cover letter. Do not provide any additional information or explanations.
-        
-        phrase: {phrase}
-        """
-        prompt = ChatPromptTemplate.from_template(prompt_template)
-        chain = prompt | self.llm_cheap | StrOutputParser()
-        response = chain.invoke({"phrase": phrase})
+        response = self.chains["resume_or_cover"].invoke({"phrase": phrase})
         if "resume" in response:
             return "resume"
         elif "cover" in response:
@@ -0,0 +1,112 @@
+import json
+from typing import List
+
+# Known overlays. 'buttons' are dismiss controls matched anywhere in the page; 'containers' scope the
+# text match, so a generic "OK" is only clicked inside an overlay of that kind. A container only counts when
+# it is an overlay (role=dialog / aria-modal, or fixed/sticky positioned), and nothing inside a <form> is
+# ever clicked, so consent or feedback sections of an application form are left to the applier.
+DEFAULT_INTERSTITIALS = [
+    {
+        "name": "cookie_consent",
+        "buttons": "#onetrust-accept-btn-handler, .cookie-accept, .accept-cookies, #cookie-accept, [data-automation='cookie-accept']",
+        "containers": "#onetrust-banner-sdk, #onetrust-consent-sdk, [id*='cookie-banner' i], [class*='cookie-banner' i], [aria-label*='cookie' i]",
+        "texts": ["accept", "accept all", "accept cookies", "ok", "agree", "i agree", "got it"],
+    },
+    {
+        "name": "app_download",
+        "buttons": "[data-automation*='app-banner'] button[aria-label*='close' i], [data-automation*='appDownload'] button[aria-label*='close' i]",
+        "containers": "[class*='app-download' i], [class*='appbanner' i], [class*='smart-banner' i], [data-automation*='app' i][role='dialog']",
+        "texts": ["not now", "no thanks", "continue in browser", "stay on web", "close"],
+    },
+    {
+        "name": "survey",
+        "buttons": "[class*='survey' i] button[aria-label*='close' i], [id*='survey' i] button[aria-label*='close' i]",
+        "containers": "[class*='survey' i][role='dialog'], [id*='survey' i][role='dialog'], [class*='survey' i][aria-modal='true']",
+        "texts": ["no thanks", "maybe later", "not now", "close", "dismiss"],
+    },
+]
+
+_DISMISS_FUNCTION = """
+window.__interstitialRules = %s;
+window.__dismissInterstitials = window.__dismissInterstitials || function () {
+    const visible = el => !!el && el.getClientRects().length > 0 && getComputedStyle(el).visibility !== "hidden";
+    const outsideForm = el => !el.closest("form");
+    const overlay = el => {
+        for (let node = el; node && node !== document.body; node = node.parentElement) {
+            if (node.getAttribute("role") === "dialog" || node.getAttribute("aria-modal") === "true") { return true; }
+            if (["fixed", "sticky"].includes(getComputedStyle(node).position)) { return true; }
+        }
+        return false;
+    };
+    const dismissed = [];
+    for (const rule of window.__interstitialRules) {
+        let target = Array.from(document.querySelectorAll(rule.buttons)).find(el => visible(el) && outsideForm(el) && overlay(el));
+        if (!target) {
+            for (const container of document.querySelectorAll(rule.containers)) {
+                if (!visible(container) || !outsideForm(container) || !overlay(container)) { continue; }
+                target = Array.from(container.querySelectorAll("button, a, [role='button']"))
+                    .find(el => visible(el) && rule.texts.includes((el.innerText || el.getAttribute("aria-label") || "").trim().toLowerCase()));
+                if (target) { break; }
+            }
+        }
+        if (target) {
+            target.click();
+            dismissed.push(rule.name);
+        }
+    }
+    return dismissed;
+};
+"""
+
+_OBSERVER = """
+if (!window.__interstitialObserver) {
+    let scheduled = false;
+    window.__interstitialObserver = new MutationObserver(() => {
+        if (scheduled) { return; }
+        scheduled = true;
+        setTimeout(() => { scheduled = false; window.__dismissInterstitials(); }, 150);
+    });
+    const observe = () => window.__interstitialObserver.observe(document.documentElement, {childList: true, subtree: true});
+    if (document.documentElement) { observe(); } else { document.addEventListener("DOMContentLoaded", observe); }
+}
+"""
+
+
+class InterstitialHandler:
+    """
+    Detects and dismisses known overlays (cookie consent, app-download prompts, survey modals)
+    with a single DOM query instead of one timed wait per selector, and can install a
+    MutationObserver that dismisses them whenever they show up later.
+    """
+
+    def __init__(self, driver, rules: List[dict] = None):
+        self.driver = driver
+        self.rules = rules or DEFAULT_INTERSTITIALS
+        self._dismiss_function = _DISMISS_FUNCTION % json.dumps(self.rules)
+
+    def dismiss(self) -> List[str]:
+        """Dismiss whatever known overlays are on the page right now; returns their names"""
+        try:
+            dismissed = self.driver.execute_script(self._dismiss_function + "return window.__dismissInterstitials();") or []
+        except Exception as e:
+            print(f"Interstitial check failed: {e}")
+            return []
+        if dismissed:
+            print(f"Dismissed interstitials: {', '.join(dismissed)}")
+        return dismissed
+
+    def install_observer(self) -> None:
+        """
+        Auto-dismiss overlays for the rest of the session in the current tab: registered through CDP
+        so it survives navigations, and injected into the already loaded document as well.
+        The CDP registration belongs to the tab, so every newly opened tab needs its own call.
+        """
+        script = self._dismiss_function + _OBSERVER
+        try:
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": script})
+        except Exception:
+            pass  # without CDP the observer only covers the current document
+        try:
+            self.driver.execute_script(script)
+        except Exception as e:
+            print(f"Could not install interstitial observer: {e}")
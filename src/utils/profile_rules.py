@@ -0,0 +1,390 @@
+import math
+import re
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+import src.utils.utils as utils
+
+# (low, high, low inclusive, high inclusive)
+Interval = Tuple[float, float, bool, bool]
+
+_CHINESE_DIGITS = {"一": "1", "二": "2", "兩": "2", "两": "2", "三": "3", "四": "4", "五": "5",
+                   "六": "6", "七": "7", "八": "8", "九": "9", "十": "10", "半": "0.5"}
+_NUMBER = re.compile(r"(\d+(?:\.\d+)?)\s*([kK萬万])?")
+_DURATION_UNITS = [
+    (re.compile(r"^\s*(?:years?|yrs?|年)"), 365), (re.compile(r"^\s*(?:months?|個月|个月|月)"), 30),
+    (re.compile(r"^\s*(?:weeks?|wks?|週|周|星期|個星期|个星期)"), 7), (re.compile(r"^\s*(?:days?|天|日)"), 1),
+]
+_LESS = re.compile(r"less than|under|below|fewer than|<|少於|少于|不足|以下|以內|以内")
+_AT_MOST = re.compile(r"or less|or fewer|up to|within|at most|\bmax(?:imum)?\b|≤|或以下|或以內|或以内")
+_MORE = re.compile(r"more than|\bover\b|above|greater than|exceed|>|超過|超过|以上")
+_AT_LEAST = re.compile(r"or more|or above|at least|\bmin(?:imum)?\b|\+|≥|或以上")
+_ZERO = re.compile(r"\bnone\b|\bno (?:\w+ )?experience|not experienced|\bnever\b|\bimmediate|\bnow\b|right away|no notice|"
+                   r"without notice|沒有|没有|無經驗|无经验|即時|即时|隨時|随时|立即|馬上|马上")
+_YES = re.compile(r"^\s*(?:(?:yes|y)\b|是|有|可以|會|会)")
+_NO = re.compile(r"^\s*(?:(?:no|n)\b|否|沒有|没有|不)")
+_NEGATED = re.compile(r"\bnot\b|\bnon[- ]|\bno\b|n't|不是|非|並非|并非")
+# salary currency and pay period, as named by the profile, a question or its options
+HKD_PER_USD = 7.8  # the HKD is pegged to the USD
+_CURRENCIES = {"hkd": re.compile(r"hk\$|hkd|港幣|港币|港元"), "usd": re.compile(r"us\$|usd|美元|美金")}
+_PERIODS = {
+    "monthly": re.compile(r"month|/\s*mth|\bmth\b|\bp\.?m\.?\b|月"),
+    "annual": re.compile(r"annual|year|\bp\.?a\.?\b|per annum|/\s*yr|年"),
+}
+_MONTHS_PER_PERIOD = {"monthly": 1, "annual": 12}
+
+LANGUAGE_ALIASES = {
+    "english": ["english", "英文", "英語", "英语"],
+    "cantonese": ["cantonese", "粵語", "粤语", "廣東話", "广东话"],
+    "mandarin": ["mandarin", "putonghua", "普通話", "普通话", "國語", "国语", "華語", "华语"],
+    "chinese": ["chinese", "中文"],
+    "japanese": ["japanese", "日文", "日語", "日语"],
+    "korean": ["korean", "韓文", "韩文", "韓語", "韩语"],
+    "french": ["french", "法文", "法語", "法语"],
+    "german": ["german", "德文", "德語", "德语"],
+    "spanish": ["spanish", "西班牙語", "西班牙语"],
+}
+# proficiency keywords, lowest to highest
+LANGUAGE_LEVELS = [
+    ["none", "no knowledge", "不懂", "不會", "不会"],
+    ["basic", "elementary", "beginner", "limited", "基本", "初級", "初级", "入門", "入门"],
+    ["intermediate", "conversational", "good", "working", "中等", "中級", "中级", "一般", "日常"],
+    ["professional", "business", "advanced", "proficient", "fluent", "流利", "流暢", "流畅", "熟練", "熟练", "高級", "高级"],
+    ["native", "mother tongue", "bilingual", "母語", "母语"],
+]
+# languages a years-of-experience question may ask about; the profile only has years per role, not per language
+PROGRAMMING_LANGUAGES = ["python", "java", "javascript", "typescript", "c++", "c#", "golang", "go", "rust", "ruby", "php",
+                         "swift", "kotlin", "scala", "sql", "matlab", "perl", "dart", "objective-c", "node.js", "vba"]
+# question keyword -> develop_role field, most specific roles first
+ROLE_KEYWORDS = [
+    (re.compile(r"ai research|research scientist|researcher|研究員|研究员"), "ai_reseachers"),
+    (re.compile(r"\bai\b|artificial intelligence|machine learning|\bml\b|deep learning|\bllm|人工智能|機器學習|机器学习"), "ai_engineer"),
+    (re.compile(r"back[- ]?end|後端|后端"), "backend_engineer"),
+    (re.compile(r"front[- ]?end|前端"), "frontend_engineer"),
+    (re.compile(r"data analy|數據分析|数据分析"), "data_analyst"),
+    (re.compile(r"software|developer|development|programming|coding|engineer|開發|开发|軟件|软件|程式|編程|编程"), "software_engineer"),
+]
+
+QUESTION_PATTERNS = {
+    "visa_in_hk": re.compile(r"right to work|work(?:ing)? visa|\bvisa\b|permanent resident|work permit|sponsor|authori[sz]ed to work|"
+                             r"eligib\w* to work|legally work|簽證|签证|工作權|工作权|永久居民|居留|工作許可|工作许可"),
+    "notice_period": re.compile(r"notice period|when can you start|available to start|availability to start|start date|earliest start|"
+                                r"how soon|通知期|到職|到职|入職|入职|上班|開始工作|开始工作"),
+    "salary_expectations": re.compile(r"salary|expected (?:monthly |annual )?(?:pay|package|compensation|remuneration)|"
+                                      r"remuneration|compensation|薪|工資|工资|待遇"),
+    "develop_role": re.compile(r"years?\b.*\bexperience|experience.*\byears?\b|how many years|how long have you|"
+                               r"年經驗|年经验|年工作經驗|年工作经验|幾多年|几多年|多少年|幾年|几年|工作經驗|工作经验"),
+    "programming_languages": re.compile(r"programming|coding|code in|tech stack|編程|编程|程式|程序語言|程序语言|開發語言|开发语言"),
+    "languages": re.compile(r"\blanguages?\b|speak|spoken|fluen|proficien|"
+                            + "|".join(alias for aliases in LANGUAGE_ALIASES.values() for alias in aliases)
+                            + r"|語言|语言"),
+}
+
+
+def _normalize(text) -> str:
+    text = " ".join(str(text or "").split()).lower()
+    return re.sub(r"[一二兩两三四五六七八九十半](?=\s*(?:個|个|年|月|週|周|星期|天|日|萬|万))",
+                  lambda m: _CHINESE_DIGITS[m.group(0)], text)
+
+
+def parse_duration_days(text) -> Optional[float]:
+    """'2 weeks' -> 14, '1 month' -> 30, '3個月' -> 90, 'Immediately' -> 0; None when no duration is given"""
+    interval = parse_interval(text, unit_scale=_duration_scale)
+    if interval is None:
+        return None
+    return interval[0] if math.isinf(interval[1]) else interval[1]  # "within 2 weeks" counts as the full 2 weeks
+
+
+def _duration_scale(following: str, default: float) -> float:
+    for pattern, days in _DURATION_UNITS:
+        if pattern.match(following):
+            return days
+    return default
+
+
+def _amount_scale(following: str, default: float) -> float:
+    return default
+
+
+def parse_interval(text, unit_scale: Callable[[str, float], float] = _amount_scale, default_unit: float = 1) -> Optional[Interval]:
+    """
+    The numeric band an option describes:
+    '1 - 2 years' -> (1, 2), 'Less than 1 year' -> [0, 1), '5+ years' -> [5, inf), 'Not experienced' -> [0, 0],
+    'HK$25k' -> [25000, 25000]. Units come from unit_scale (the text after each number); None when nothing numeric is found.
+    """
+    text = re.sub(r"(?<=\d),(?=\d{3}\b)", "", _normalize(text))
+    values = []
+    for match in _NUMBER.finditer(text):
+        value = float(match.group(1))
+        multiplier = match.group(2)
+        if multiplier in ("k",):
+            value *= 1000
+        elif multiplier in ("萬", "万"):
+            value *= 10000
+        values.append((value, match.end()))
+    if not values:
+        return (0, 0, True, True) if _ZERO.search(text) else None
+
+    # a unit written once after the last number applies to every number ("1 - 2 years")
+    last_unit = unit_scale(text[values[-1][1]:], default_unit)
+    numbers = [value * (unit_scale(text[end:], 0) or last_unit) for value, end in values]
+    if len(numbers) >= 2:
+        return min(numbers[:2]), max(numbers[:2]), True, True
+    number = numbers[0]
+    if _AT_MOST.search(text):
+        return 0, number, True, True
+    if _LESS.search(text):
+        return 0, number, True, False
+    if _AT_LEAST.search(text):
+        return number, math.inf, True, True
+    if _MORE.search(text):
+        return number, math.inf, False, True
+    return number, number, True, True
+
+
+def _named(patterns: Dict[str, "re.Pattern"], text: str) -> Optional[str]:
+    """The one key whose pattern occurs in text; None when none or several do"""
+    found = [name for name, pattern in patterns.items() if pattern.search(text)]
+    return found[0] if len(found) == 1 else None
+
+
+def _contains(interval: Interval, value: float) -> bool:
+    low, high, low_inclusive, high_inclusive = interval
+    return (low < value or (low_inclusive and low == value)) and (value < high or (high_inclusive and high == value))
+
+
+def _distance(interval: Interval, value: float) -> float:
+    low, high = interval[0], interval[1]
+    return 0 if low <= value <= high else min(abs(value - low), abs(value - high))
+
+
+def pick_interval_option(options: Dict[str, str], value: float, unit_scale=_amount_scale, default_unit: float = 1,
+                         max_relative_gap: float = math.inf) -> Optional[str]:
+    """
+    The option whose band contains value (the narrowest one when bands overlap). When none contains it and every
+    option is a band, the nearest band within max_relative_gap of value. None when the options are not bands.
+    """
+    intervals = {letter: parse_interval(text, unit_scale, default_unit) for letter, text in options.items()}
+    parsed = {letter: interval for letter, interval in intervals.items() if interval is not None}
+    if not parsed:
+        return None
+    containing = [letter for letter, interval in parsed.items() if _contains(interval, value)]
+    if containing:
+        return min(containing, key=lambda letter: parsed[letter][1] - parsed[letter][0])
+    if len(parsed) != len(options):
+        return None
+    nearest = min(parsed, key=lambda letter: _distance(parsed[letter], value))
+    if _distance(parsed[nearest], value) > max_relative_gap * max(value, 1):
+        return None
+    return nearest
+
+
+def _mentions(text: str, term: str) -> bool:
+    """Whole-word match for latin terms ('Java' is not in 'JavaScript', 'C' is not in 'C++'), substring for CJK"""
+    term = term.lower()
+    if re.search(r"[一-鿿]", term):
+        return term in text
+    return re.search(rf"(?<![\w+#]){re.escape(term)}(?![\w+#])", text) is not None
+
+
+class ProfileRuleEngine:
+    """
+    Deterministic answers for questions that are a straight lookup in the SimplifiedJobApplicationProfile:
+    right to work in HK, notice period, expected salary, spoken languages, years in a development role and
+    programming languages, asked in English or Chinese.
+
+    answer(question) returns the option letters (["B"] / ["A", "C"]) only when a rule is confident: the question
+    matches a rule's pattern and the profile fact maps onto the options without ambiguity (a years/salary/notice
+    band containing the profile value, the option naming the profile's language or visa type). Anything else
+    returns None and goes to the LLM. Free-text questions (no options) always go to the LLM.
+    """
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.rules: List[Tuple[str, Callable[[str, Dict[str, str], bool], Optional[List[str]]]]] = [
+            ("visa_in_hk", self._visa_rule),
+            ("notice_period", self._notice_period_rule),
+            ("salary_expectations", self._salary_rule),
+            ("develop_role", self._develop_role_rule),
+            ("programming_languages", self._programming_languages_rule),
+            ("languages", self._languages_rule),
+        ]
+        self.matched = Counter()
+        self.fallbacks = 0
+
+    def answer(self, question) -> Optional[List[str]]:
+        if not isinstance(question, dict) or not question.get("options"):
+            return None
+        text = _normalize(question.get("Question"))
+        options = {letter: str(option) for letter, option in question["options"].items()}
+        multi_select = bool(question.get("multi_select"))
+
+        for name, rule in self.rules:
+            if not QUESTION_PATTERNS[name].search(text):
+                continue
+            try:
+                letters = rule(text, options, multi_select)
+            except (AttributeError, TypeError, ValueError):
+                letters = None  # profile field missing or malformed, let the LLM read it
+            if letters:
+                self.matched[name] += 1
+                print(f"Profile rule '{name}' answered: {letters}")
+                return letters
+        self.fallbacks += 1
+        return None
+
+    def report(self) -> str:
+        matched = sum(self.matched.values())
+        total = matched + self.fallbacks
+        rate = f"{matched / total:.0%}" if total else "n/a"
+        per_rule = ", ".join(f"{name}: {self.matched[name]}" for name, _ in self.rules)
+        summary = f"Profile rules: {matched}/{total} questions answered without the LLM ({rate}), {self.fallbacks} fell back; per rule - {per_rule}"
+        utils.printyellow(summary)
+        return summary
+
+    @staticmethod
+    def _yes_no(options: Dict[str, str]) -> Optional[Tuple[str, str]]:
+        """(yes letter, no letter) when the options are a yes/no pair"""
+        yes = [letter for letter, text in options.items() if _YES.search(_normalize(text))]
+        no = [letter for letter, text in options.items() if _NO.search(_normalize(text))]
+        if len(options) == 2 and len(yes) == 1 and len(no) == 1 and yes != no:
+            return yes[0], no[0]
+        return None
+
+    def _visa_rule(self, text, options, multi_select):
+        visa = self.profile.visa_in_hk
+        profile_text = _normalize(f"{visa.visa_situation} {visa.visa_type}")
+        permanent = ("permanent" in profile_text or "永久" in profile_text) and not _NEGATED.search(profile_text)
+        needs_sponsorship = not permanent and self.profile.is_visa_required()
+
+        yes_no = self._yes_no(options)
+        if yes_no:
+            if re.search(r"sponsor|require\w* (?:a )?visa|need\w* (?:a )?visa|需要.*(?:簽證|签证)|擔保|担保", text):
+                holds = needs_sponsorship
+            elif re.search(r"permanent resident|永久居民", text):
+                holds = permanent
+            elif re.search(r"right to work|eligib\w* to work|authori[sz]ed to work|legally work|工作權|工作权|可以.*工作", text):
+                holds = not needs_sponsorship
+            else:
+                return None
+            return [yes_no[0] if holds else yes_no[1]]
+
+        visa_type = _normalize(visa.visa_type)
+        named = [letter for letter, option in options.items()
+                 if visa_type and _mentions(_normalize(option), visa_type) and not _NEGATED.search(_normalize(option))]
+        if len(named) == 1:
+            return named
+
+        def category(option: str) -> Optional[str]:
+            option = _normalize(option)
+            if re.search(r"permanent|永久", option):
+                return None if _NEGATED.search(option) else "permanent"
+            if re.search(r"sponsor|require|need|需要|擔保|担保", option):
+                return "sponsorship"
+            if re.search(r"visa|iang|qmas|ttps|asmtp|gep|permit|簽證|签证|許可|许可", option):
+                return "temporary"
+            return None
+
+        wanted = "permanent" if permanent else "sponsorship" if needs_sponsorship else "temporary"
+        matching = [letter for letter, option in options.items() if category(option) == wanted]
+        return matching if len(matching) == 1 else None
+
+    def _notice_period_rule(self, text, options, multi_select):
+        days = parse_duration_days(self.profile.availability.notice_period)
+        if days is None:
+            return None
+        letter = pick_interval_option(options, days, _duration_scale, default_unit=30 if re.search(r"month|月", text) else 1,
+                                      max_relative_gap=0.5)
+        return [letter] if letter else None
+
+    def _salary_rule(self, text, options, multi_select):
+        if re.search(r"current|present|last|previous|目前|現時|现时|現在|现在|上一份", text):
+            return None  # the profile only knows the expected salary
+        profile_text = _normalize(self.profile.salary_expectations.salary_range_usd)
+        band = parse_interval(profile_text)
+        if band is None or math.isinf(band[1]):
+            return None
+        # salary_range_usd is an annual USD figure unless its text says otherwise
+        profile_currency = _named(_CURRENCIES, profile_text) or "usd"
+        profile_period = _named(_PERIODS, profile_text) or "annual"
+
+        # the form must say which currency and period its bands are in, guessing is what the LLM is for
+        asked = " ".join([text] + [_normalize(option) for option in options.values()])
+        currency, period = _named(_CURRENCIES, asked), _named(_PERIODS, asked)
+        if currency is None or period is None:
+            return None
+
+        expected = (band[0] + band[1]) / 2
+        if profile_currency != currency:
+            expected = expected * HKD_PER_USD if currency == "hkd" else expected / HKD_PER_USD
+        expected = expected / _MONTHS_PER_PERIOD[profile_period] * _MONTHS_PER_PERIOD[period]
+        # a band more than 25% away from the converted expectation is not a close enough answer
+        letter = pick_interval_option(options, expected, max_relative_gap=0.25)
+        return [letter] if letter else None
+
+    def _develop_role_rule(self, text, options, multi_select):
+        known = [language.lower() for language in self.profile.get_programming_languages_list() if language]
+        if any(_mentions(text, language) for language in PROGRAMMING_LANGUAGES + known):
+            return None  # "years of Python experience" is not the software engineer role years
+        role = next((field for pattern, field in ROLE_KEYWORDS if pattern.search(text)), None)
+        if role is None:
+            return None
+        days = parse_interval(getattr(self.profile.develop_role, role), _duration_scale, default_unit=365)
+        if days is None:
+            return None
+        letter = pick_interval_option(options, days[0] / 365, lambda following, default: _duration_scale(following, default * 365) / 365,
+                                      default_unit=1, max_relative_gap=0.5)
+        return [letter] if letter else None
+
+    def _programming_languages_rule(self, text, options, multi_select):
+        known = [language.lower() for language in self.profile.get_programming_languages_list() if language]
+        yes_no = self._yes_no(options)
+        if yes_no:
+            named = [language for language in known if _mentions(text, language)]
+            return [yes_no[0]] if named else None  # a language missing from the profile is for the LLM to judge
+
+        matching = [letter for letter, option in options.items()
+                    if any(_mentions(_normalize(option), language) for language in known)]
+        if not matching or (len(matching) > 1 and not multi_select):
+            return None
+        return matching
+
+    def _language_keys(self, text: str) -> List[str]:
+        return [key for key, aliases in LANGUAGE_ALIASES.items() if any(_mentions(text, alias) for alias in aliases)]
+
+    @staticmethod
+    def _level(text: str) -> Optional[int]:
+        text = _normalize(text)
+        found = [rank for rank, keywords in enumerate(LANGUAGE_LEVELS) if any(_mentions(text, keyword) for keyword in keywords)]
+        return max(found) if found else None
+
+    def _languages_rule(self, text, options, multi_select):
+        spoken = {}
+        for language in self.profile.languages:
+            for key in self._language_keys(_normalize(language.language)):
+                spoken[key] = self._level(language.proficiency)
+
+        option_languages = {letter: self._language_keys(_normalize(option)) for letter, option in options.items()}
+        if any(option_languages.values()):
+            # "Which languages do you speak?" - options are languages; "fluent in" only counts the ones spoken that well
+            required = self._level(text)
+            matching = [letter for letter, keys in option_languages.items()
+                        if any(key in spoken and (required is None or (spoken[key] or 0) >= required) for key in keys)]
+            if not matching or (len(matching) > 1 and not multi_select):
+                return None
+            return matching
+
+        # "What is your level of English?" - options are proficiency levels of the one language asked about
+        asked = self._language_keys(text)
+        if len(asked) != 1 or spoken.get(asked[0]) is None:
+            return None
+        level = spoken[asked[0]]
+        levels = {letter: self._level(option) for letter, option in options.items()}
+        if None in levels.values():
+            return None
+        exact = [letter for letter, option_level in levels.items() if option_level == level]
+        if len(exact) == 1:
+            return exact
+        below = [letter for letter, option_level in levels.items() if option_level < level]
+        if exact or not below:
+            return None
+        return [max(below, key=lambda letter: levels[letter])]  # the highest level the profile still meets
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Optional
+
+CACHE_PATH = r"./env/score_cache.json"
+
+
+def _normalize(text) -> str:
+    return " ".join(str(text or "").split()).lower()
+
+
+def rubric_version(*parts) -> str:
+    """Hash of everything that shapes a score: the prompt, the threshold, the blacklists, the description budget"""
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class ScoreCache:
+    """
+    Persistent cache of apply-decision scores, so a job seen again (a re-run, another search query,
+    a repost under a new job id) is not scored by the LLM twice.
+
+    The key is a hash of the normalized title, company and description; the job id is not part of it.
+    The whole cache is dropped when the rubric_version it was scored under changes.
+
+    Stored structure: {
+        "rubric_version": "<sha256>",
+        "scores": {"<content hash>": {"score": "7", "title": "...", "company": "...", "job_ids": ["123"], "saved_at": "2024-01-01 10:00:00"}}
+    }
+    """
+
+    def __init__(self, rubric_version: str, cache_path: str = CACHE_PATH):
+        self.cache_path = cache_path
+        self.rubric_version = rubric_version
+        self._lock = threading.Lock()
+        self.scores = self._load()
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self) -> dict:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if not isinstance(data, dict) or data.get("rubric_version") != self.rubric_version:
+            print("Score cache was built with another scoring rubric, starting empty.")
+            return {}
+        return data.get("scores", {})
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            json.dump({"rubric_version": self.rubric_version, "scores": self.scores}, f, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def key(job_info: dict) -> str:
+        description = job_info.get("detailed_page")
+        if isinstance(description, dict):
+            description = "\n".join(f"{title}: {text}" for title, text in description.items())
+        content = "\n".join(_normalize(part) for part in (job_info.get("title"), job_info.get("company"), description))
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get(self, job_info: dict) -> Optional[str]:
+        """The cached raw score (e.g. "7"), None when this content was never scored under the current rubric"""
+        entry = self.scores.get(self.key(job_info))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        job_id = str(job_info.get("job_id", ""))
+        if job_id and job_id not in entry.get("job_ids", []):
+            with self._lock:
+                entry.setdefault("job_ids", []).append(job_id)  # a repost of a job scored before
+                self._save()
+        return entry["score"]
+
+    def put(self, job_info: dict, score: str) -> None:
+        entry = {
+            "score": score,
+            "title": job_info.get("title"),
+            "company": job_info.get("company"),
+            "job_ids": [str(job_info["job_id"])] if job_info.get("job_id") else [],
+            "saved_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        with self._lock:
+            self.scores[self.key(job_info)] = entry
+            self._save()
@@ -0,0 +1,252 @@
+"""
+Local replacement for the section-routing LLM call.
+
+The first call of SimplifedGPT.standard_simplified_profile_chain (7 profile sections) and of
+GPTAnswerer.answer_question_textual_wide_range (12 resume sections) only picks a section name.
+SectionClassifier learns that decision from the routing calls recorded in
+data_folder/output/open_ai_calls.json: hashed word and character n-grams, a softmax linear model,
+NumPy only. Routers defer to the LLM whenever the classifier is less confident than min_confidence.
+
+    python -m src.utils.section_classifier [--log data_folder/output/open_ai_calls.json] [--holdout 0.2] [--min-confidence 0.8]
+
+retrains both routers and prints their accuracy on held-out logged decisions.
+"""
+import argparse
+import ast
+import json
+import os
+import random
+import re
+import zlib
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+
+CALLS_LOG = os.path.join("data_folder", "output", "open_ai_calls.json")
+MODEL_PATHS = {
+    "profile": r"./env/section_router_profile.npz",  # SimplifedGPT, 7 sections
+    "resume": r"./env/section_router_resume.npz",  # GPTAnswerer, 12 sections
+}
+MIN_CONFIDENCE = 0.8
+
+_ROUTER_QUESTION = re.compile(r"For the following question: '(.*)', determine which section", re.DOTALL)
+_NON_SPACE = re.compile(r"\S")
+
+
+def question_text(question) -> str:
+    """The text the router sees: question plus option texts, for plain questions and {"Question", "options"} dicts"""
+    if isinstance(question, str):
+        try:
+            question = ast.literal_eval(question)  # logged prompts hold the dict's repr
+        except (ValueError, SyntaxError):
+            return question
+    if isinstance(question, dict):
+        options = question.get("options") or {}
+        return " ".join([str(question.get("Question", ""))] + [str(option) for option in options.values()])
+    return str(question)
+
+
+def _normalize_section(reply: str) -> str:
+    return reply.strip().strip(".'\"*").lower().replace(" ", "_")
+
+
+class HashedNgramFeaturizer:
+    """Word 1-2 grams and character 2-4 grams hashed into n_features buckets (crc32, so stable across runs)"""
+
+    def __init__(self, n_features: int = 2 ** 13):
+        self.n_features = n_features
+
+    @staticmethod
+    def _ngrams(text: str) -> Iterator[str]:
+        text = " ".join(text.lower().split())
+        words = re.findall(r"\w+", text)
+        for i, word in enumerate(words):
+            yield f"w:{word}"
+            if i + 1 < len(words):
+                yield f"w:{word} {words[i + 1]}"
+        padded = f" {text} "
+        for n in (2, 3, 4):
+            for i in range(len(padded) - n + 1):
+                yield f"c:{padded[i:i + n]}"
+
+    def transform(self, texts: List[str]) -> np.ndarray:
+        features = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for gram in self._ngrams(text):
+                features[row, zlib.crc32(gram.encode("utf-8")) % self.n_features] += 1.0
+            norm = np.linalg.norm(features[row])
+            if norm:
+                features[row] /= norm
+        return features
+
+
+class SectionClassifier:
+    """Softmax regression over hashed n-grams; predict returns (section, confidence)"""
+
+    def __init__(self, labels: List[str], n_features: int = 2 ** 13):
+        self.labels = list(labels)
+        self.featurizer = HashedNgramFeaturizer(n_features)
+        self.weights = np.zeros((n_features, len(self.labels)), dtype=np.float32)
+        self.bias = np.zeros(len(self.labels), dtype=np.float32)
+
+    @staticmethod
+    def _softmax(scores: np.ndarray) -> np.ndarray:
+        scores = scores - scores.max(axis=1, keepdims=True)
+        exp = np.exp(scores)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def fit(self, questions: List[str], sections: List[str], epochs: int = 300, learning_rate: float = 2.0,
+            l2: float = 1e-4) -> "SectionClassifier":
+        """Full-batch gradient descent on the cross-entropy; a few hundred logged questions train in well under a second"""
+        features = self.featurizer.transform([question_text(question) for question in questions])
+        targets = np.zeros((len(sections), len(self.labels)), dtype=np.float32)
+        targets[np.arange(len(sections)), [self.labels.index(section) for section in sections]] = 1.0
+        for _ in range(epochs):
+            error = self._softmax(features @ self.weights + self.bias) - targets
+            self.weights -= learning_rate * (features.T @ error / len(sections) + l2 * self.weights)
+            self.bias -= learning_rate * error.mean(axis=0)
+        return self
+
+    def predict_proba(self, questions: List) -> np.ndarray:
+        features = self.featurizer.transform([question_text(question) for question in questions])
+        return self._softmax(features @ self.weights + self.bias)
+
+    def predict(self, question) -> Tuple[str, float]:
+        probabilities = self.predict_proba([question])[0]
+        best = int(probabilities.argmax())
+        return self.labels[best], float(probabilities[best])
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez_compressed(path, weights=self.weights, bias=self.bias, labels=np.array(self.labels))
+
+    @classmethod
+    def load(cls, path: str) -> Optional["SectionClassifier"]:
+        """The saved classifier, None when it has not been trained yet"""
+        try:
+            data = np.load(path)
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+        classifier = cls([str(label) for label in data["labels"]], n_features=data["weights"].shape[0])
+        classifier.weights = data["weights"]
+        classifier.bias = data["bias"]
+        return classifier
+
+
+class LocalSectionRouter:
+    """
+    The trained classifier behind a confidence threshold. route returns the section name, or None to ask
+    the LLM. Without a trained model every question goes to the LLM.
+    """
+
+    def __init__(self, router: str, min_confidence: float = MIN_CONFIDENCE):
+        self.router = router
+        self.min_confidence = min_confidence
+        self.classifier = SectionClassifier.load(MODEL_PATHS[router])
+        self.local = 0
+        self.deferred = 0
+
+    def route(self, question) -> Optional[str]:
+        if self.classifier is None:
+            return None
+        section, confidence = self.classifier.predict(question)
+        if confidence < self.min_confidence:
+            self.deferred += 1
+            return None
+        self.local += 1
+        print(f"Local router ({self.local} local / {self.deferred} deferred): {section} ({confidence:.2f})")
+        return section
+
+
+def _log_entries(log_path: str) -> Iterator[dict]:
+    """open_ai_calls.json is a stream of indented JSON objects, not a JSON document"""
+    try:
+        with open(log_path, "r", encoding="utf-8") as f:
+            content = f.read()
+    except FileNotFoundError:
+        return
+    decoder = json.JSONDecoder()
+    position = 0
+    while True:
+        match = _NON_SPACE.search(content, position)
+        if match is None:
+            return
+        try:
+            entry, position = decoder.raw_decode(content, match.start())
+        except json.JSONDecodeError:
+            return  # a truncated last entry from an interrupted run
+        if isinstance(entry, dict):
+            yield entry
+
+
+def load_routing_decisions(log_path: str = CALLS_LOG) -> Dict[str, List[Tuple[str, str]]]:
+    """{"profile"|"resume": [(question, section), ...]} from the logged section-router calls, oldest first"""
+    decisions = {router: [] for router in MODEL_PATHS}
+    for entry in _log_entries(log_path):
+        prompts = entry.get("prompts")
+        prompt = "\n".join(prompts.values()) if isinstance(prompts, dict) else str(prompts or "")
+        match = _ROUTER_QUESTION.search(prompt)
+        if not match or not isinstance(entry.get("replies"), str):
+            continue
+        router = "profile" if "Visa In HK" in prompt else "resume"
+        decisions[router].append((match.group(1), _normalize_section(entry["replies"])))
+    return decisions
+
+
+def train_router(decisions: List[Tuple[str, str]], holdout: float = 0.2, min_confidence: float = MIN_CONFIDENCE,
+                 seed: int = 0) -> Tuple[Optional[SectionClassifier], dict]:
+    """
+    Fit on the logged decisions, report accuracy on a held-out share of them, then refit on everything.
+    The latest decision wins when a question was routed more than once.
+    """
+    latest = dict(decisions)
+    samples = list(latest.items())
+    labels = sorted(set(latest.values()))
+    report = {"samples": len(samples), "sections": dict(Counter(latest.values()))}
+    if len(labels) < 2:
+        return None, report
+
+    random.Random(seed).shuffle(samples)
+    held_out = samples[:int(len(samples) * holdout)]
+    train = samples[len(held_out):]
+    if held_out:
+        classifier = SectionClassifier(labels).fit([q for q, _ in train], [s for _, s in train])
+        probabilities = classifier.predict_proba([q for q, _ in held_out])
+        predicted = [labels[i] for i in probabilities.argmax(axis=1)]
+        confident = probabilities.max(axis=1) >= min_confidence
+        correct = np.array([p == s for p, (_, s) in zip(predicted, held_out)])
+        report.update({
+            "held_out": len(held_out),
+            "accuracy": float(correct.mean()),
+            "coverage": float(confident.mean()),  # share answered locally at min_confidence
+            "confident_accuracy": float(correct[confident].mean()) if confident.any() else None,
+        })
+    classifier = SectionClassifier(labels).fit([q for q, _ in samples], [s for _, s in samples])
+    return classifier, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retrain the local section routers from the logged LLM routing calls")
+    parser.add_argument("--log", default=CALLS_LOG)
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument("--min-confidence", type=float, default=MIN_CONFIDENCE)
+    args = parser.parse_args()
+
+    for router, decisions in load_routing_decisions(args.log).items():
+        classifier, report = train_router(decisions, args.holdout, args.min_confidence)
+        if classifier is None:
+            print(f"{router}: {report['samples']} logged decisions, not enough to train (need 2+ sections)")
+            continue
+        classifier.save(MODEL_PATHS[router])
+        print(f"{router}: trained on {report['samples']} decisions over {len(report['sections'])} sections -> {MODEL_PATHS[router]}")
+        if "accuracy" in report:
+            confident = "n/a" if report["confident_accuracy"] is None else f"{report['confident_accuracy']:.1%}"
+            print(f"  held-out {report['held_out']}: accuracy {report['accuracy']:.1%}, "
+                  f"answered locally {report['coverage']:.1%} at confidence >= {args.min_confidence} with accuracy {confident}")
+        print(f"  sections: {report['sections']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,36 @@
+import json
+from operator import itemgetter
 from src.utils.gpt import LoggerChatModel
 from langchain_core.messages.ai import AIMessage
-from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompt_values import StringPromptValue
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig, RunnableLambda, RunnableParallel
 from langchain_xai import ChatXAI
 import src.utils.strings as strings
+from src.utils.answer_cache import AnswerCache
+from src.utils.chain_registry import ChainRegistry, strings_templates
+from src.utils.description_compactor import DEFAULT_TOKEN_BUDGET, DescriptionCompactor
+from src.utils.fused_answer import parse_batch_answers, parse_fused_answer, render_profile_sections
+from src.utils.profile_rules import ProfileRuleEngine
+from src.utils.score_cache import ScoreCache, rubric_version
+from src.utils.section_classifier import LocalSectionRouter
 
 
 COMPANY_BLACKLIST = ["TCL"]
 JOB_TITLE_BLACKLIST = ["solution enginner", "manager"]
 THRESHOLD = 6
 
-class SimplifedGPT:
-    def __init__(self, open_ai_key: str, model_name: str = "grok-3-mini", temperature: float = 0.4):
-        self.llm = ChatXAI(
-            model=model_name, 
-            temperature=temperature, 
-        )
-        
-        self.model = LoggerChatModel(self.llm)
-    
-    def set_job_application_profile(self, job_application_profile):
-        self.job_application_profile = job_application_profile
-    
-    def _create_chain(self, template: str):
-        prompt = ChatPromptTemplate.from_template(template)
-        return prompt | self.llm | StrOutputParser()
-    
-    def standard_simplified_profile_chain(self, question: str):
-        chains = {
-            "experience_details": self._create_chain(strings.experience_details_template),
-            "availability": self._create_chain(strings.availability_template),
-            "salary_expectations": self._create_chain(strings.salary_expectations_template),
-            "languages": self._create_chain(strings.languages_template),
-            "visa_in_hk": self._create_chain(strings.visa_in_hk_template),
-            "develop_role": self._create_chain(strings.develop_role_template),
-            "programming_languages": self._create_chain(strings.programming_language_template),
-        }
-        
-        section_prompt = """
+# profile section -> strings.py template answering from it
+SECTION_TEMPLATES = {
+    "experience_details": "experience_details_template",
+    "availability": "availability_template",
+    "salary_expectations": "salary_expectations_template",
+    "languages": "languages_template",
+    "visa_in_hk": "visa_in_hk_template",
+    "develop_role": "develop_role_template",
+    "programming_languages": "programming_language_template",
+}
+
+SECTION_PROMPT = """
         You are assisting a bot designed to automatically apply for jobs. The bot receives various questions about job applications and needs to determine the most relevant section of the profile to provide an accurate response.
 
         For the following question: '{question}', determine which section is most relevant. 
@@ -63,22 +55,192 @@ class SimplifedGPT:
 
         Provide only the exact name of the section from the list above with no additional text.
         """
+
+class SimplifedGPT:
+    def __init__(self, open_ai_key: str, model_name: str = "grok-3-mini", temperature: float = 0.4, answer_mode: str = "two_step",
+                 max_concurrency: int = 4, description_token_budget: int = DEFAULT_TOKEN_BUDGET):
+        self.llm = ChatXAI(
+            model=model_name, 
+            temperature=temperature, 
+        )
+        
+        self.model = LoggerChatModel(self.llm)
+        # every prompt compiled once, shared by all questions and jobs
+        self.chains = ChainRegistry(self.llm, strings_templates())
+        # routing calls are logged, they are the training data of the local router (python -m src.utils.section_classifier)
+        self.chains.register("section_router", SECTION_PROMPT, llm=self.model)
+        self.local_router = LocalSectionRouter("profile")
+        # "two_step": route to a section, then answer from it; "fused": one call doing both (ANSWER_MODE)
+        self.answer_mode = answer_mode
+        # upper bound on LLM requests in flight for the batched methods, sync and async (Runnable max_concurrency)
+        self.max_concurrency = max_concurrency
+        # job descriptions are cut to this many tokens before any prompt sees them (DESCRIPTION_TOKEN_BUDGET)
+        self.description_compactor = DescriptionCompactor(description_token_budget)
+        # a job is rescored only when its content or the scoring rubric changes
+        self.score_cache = ScoreCache(rubric_version(strings.apply_decision_template, THRESHOLD, COMPANY_BLACKLIST,
+                                                     JOB_TITLE_BLACKLIST, description_token_budget, model_name))
+    
+    def set_job_application_profile(self, job_application_profile):
+        self.job_application_profile = job_application_profile
+        self.answer_cache = AnswerCache(getattr(job_application_profile, "source_hash", None))
+        self.profile_rules = ProfileRuleEngine(job_application_profile)
+        self.profile_text = render_profile_sections([job_application_profile], SECTION_TEMPLATES)
+    
+    def standard_simplified_profile_chain(self, question: str):
+        """
+        Answer a questionnaire item from the profile. Questions a profile rule can answer deterministically and
+        repeated questions (answer cache) never reach the LLM.
+        """
+        known = self._known_answer(question)
+        if known is not None:
+            return known
+        answer = self._llm_answer(question)
+        self.answer_cache.put(question, answer)
+        return answer
+
+    def _llm_answer(self, question, config: RunnableConfig = None):
+        result = self.fused_answer(question, config) if self.answer_mode == "fused" else None
+        _, answer = result or self.route_and_answer(question, config)
+        return answer
+
+    async def _allm_answer(self, question, config: RunnableConfig = None):
+        result = await self.afused_answer(question, config) if self.answer_mode == "fused" else None
+        _, answer = result or await self.aroute_and_answer(question, config)
+        return answer
+
+    def _known_answer(self, question):
+        """Answer from the profile rules or the answer cache, None when the LLM has to answer"""
+        answer = self.profile_rules.answer(question)
+        if answer is not None:
+            return answer
+        cached = self.answer_cache.get(question)
+        if cached is not None:
+            print(f"Answer cache hit ({self.answer_cache.hits} hits / {self.answer_cache.misses} misses): {cached}")
+        return cached
+
+    def answer_questions_batch(self, questions: dict) -> dict:
+        """
+        Answer a whole form at once. questions: {id: {"Question": text, "options": {"A": text, ...}, "multi_select": bool}}
+        Returns {id: ["A", ...]}; rule-answered and cached questions are answered locally and the rest in one LLM call.
+        Ids missing from the result were not answered and need the per-question path.
+        """
+        answers, pending = {}, {}
+        for question_id, question in questions.items():
+            known = self._known_answer(question)
+            if known is not None:
+                answers[question_id] = known
+            else:
+                pending[question_id] = question
+        if not pending:
+            return answers
+
+        output = self.chains["batch_profile_answer_template"].invoke({
+            "sections": ", ".join(SECTION_TEMPLATES),
+            "profile": self.profile_text,
+            "questions": json.dumps(pending, ensure_ascii=False, indent=1),
+        })
+        for question_id, answer in parse_batch_answers(output).items():
+            if question_id in pending:
+                answers[question_id] = answer.split(",")
+                self.answer_cache.put(pending[question_id], answers[question_id])
+        print(f"Batch answered {len(answers)}/{len(questions)} questions ({len(questions) - len(pending)} without the LLM)")
+        return answers
+
+    def fused_answer(self, question: str, config: RunnableConfig = None):
+        """One LLM call choosing the section and answering; returns (section, answer) or None if the reply is unusable"""
+        output = self.chains["fused_profile_answer_template"].invoke(self._fused_inputs(question), config=config)
+        return self._parse_fused_output(output)
+
+    async def afused_answer(self, question: str, config: RunnableConfig = None):
+        output = await self.chains["fused_profile_answer_template"].ainvoke(self._fused_inputs(question), config=config)
+        return self._parse_fused_output(output)
+
+    def _fused_inputs(self, question: str) -> dict:
+        return {"sections": ", ".join(SECTION_TEMPLATES), "profile": self.profile_text, "question": question}
+
+    @staticmethod
+    def _parse_fused_output(output: str):
+        parsed = parse_fused_answer(output)
+        if parsed is None:
+            print(f"Fused answer not parseable, falling back to two-step: {output}")
+            return None
+        section_name, answer = parsed
+        return section_name, answer.split(",")
+
+    def route_and_answer(self, question: str, config: RunnableConfig = None):
+        """
+        Two LLM calls: route the question to a profile section, then answer from it. Returns (section, answer).
+        The routing call is skipped when the local router is confident.
+        """
+        output = self.local_router.route(question) or self.chains["section_router"].invoke({"question": question}, config=config)
+        section_name, template_name, resume_section = self._resolve_section(output)
+        ai_answer = self.chains[template_name].invoke({"resume_section": resume_section, "question": question}, config=config)
         
-        prompt = ChatPromptTemplate.from_template(section_prompt)
-        chain = prompt | self.llm | StrOutputParser()
-        output = chain.invoke({"question": question})
-        section_name = output.lower().replace(" ", "_")
+        return section_name, ai_answer.split(",")
+
+    async def aroute_and_answer(self, question: str, config: RunnableConfig = None):
+        output = self.local_router.route(question) or await self.chains["section_router"].ainvoke({"question": question}, config=config)
+        section_name, template_name, resume_section = self._resolve_section(output)
+        ai_answer = await self.chains[template_name].ainvoke({"resume_section": resume_section, "question": question}, config=config)
+
+        return section_name, ai_answer.split(",")
+
+    def _resolve_section(self, router_output: str):
+        section_name = router_output.lower().replace(" ", "_")
         
         resume_section = getattr(self.job_application_profile, section_name, None)
         if resume_section is None:
             raise ValueError(f"Section '{section_name}' not found in job_application_profile.")
         
-        chain = chains.get(section_name)
-        if chain is None:
+        template_name = SECTION_TEMPLATES.get(section_name)
+        if template_name is None:
             raise ValueError(f"Chain not defined for section '{section_name}'")
-        ai_answer = chain.invoke({"resume_section": resume_section, "question": question})
-        
-        return ai_answer.split(",")
+        return section_name, template_name, resume_section
+
+    def answer_questions(self, questions: dict) -> dict:
+        """
+        standard_simplified_profile_chain for many independent questions: {id: question} -> {id: answer}.
+        The LLM-bound questions go through one Runnable.batch capped at max_concurrency questions; each
+        question's calls run in sequence and get the batch's config, so at most max_concurrency LLM
+        requests are in flight. Questions that fail are left out of the result.
+        """
+        answers, pending = self._split_known(questions)
+        if pending:
+            results = self._answer_runnable().batch(list(pending.values()), config=self._batch_config(), return_exceptions=True)
+            self._store_answers(answers, pending, results)
+        return answers
+
+    async def aanswer_questions(self, questions: dict) -> dict:
+        """Async answer_questions, for callers already running an event loop (Runnable.abatch, same limit)"""
+        answers, pending = self._split_known(questions)
+        if pending:
+            results = await self._answer_runnable().abatch(list(pending.values()), config=self._batch_config(), return_exceptions=True)
+            self._store_answers(answers, pending, results)
+        return answers
+
+    def _answer_runnable(self) -> RunnableLambda:
+        return RunnableLambda(self._llm_answer, afunc=self._allm_answer)
+
+    def _batch_config(self) -> RunnableConfig:
+        return {"max_concurrency": self.max_concurrency}
+
+    def _split_known(self, questions: dict):
+        answers, pending = {}, {}
+        for question_id, question in questions.items():
+            known = self._known_answer(question)
+            if known is not None:
+                answers[question_id] = known
+            else:
+                pending[question_id] = question
+        return answers, pending
+
+    def _store_answers(self, answers: dict, pending: dict, results: list) -> None:
+        for (question_id, question), result in zip(pending.items(), results):
+            if isinstance(result, Exception):
+                print(f"Concurrent answer failed: {result}")
+                continue
+            self.answer_cache.put(question, result)
+            answers[question_id] = result
     
     def job_info_parser(self, job_info):
         """
@@ -92,56 +254,82 @@ class SimplifedGPT:
             "title": "Senior Software Engineer",
             "detailed_page": "B"  # Index of selected document style
         }
+        Title correction and document selection don't depend on each other and run as one RunnableParallel.
         """
-        
-        # Create chains for the two tasks
-        job_title_chain = self._create_chain(strings.job_info)
-        document_selection_chain = self._create_chain(strings.document_selection)
-        
+        parallel, inputs = self._job_info_requests(job_info)
+        if parallel is not None:
+            self._store_job_info(job_info, parallel.invoke(inputs, config=self._batch_config()))
+        return job_info
+
+    async def ajob_info_parser(self, job_info):
+        """Async job_info_parser, for callers already running an event loop"""
+        parallel, inputs = self._job_info_requests(job_info)
+        if parallel is not None:
+            self._store_job_info(job_info, await parallel.ainvoke(inputs, config=self._batch_config()))
+        return job_info
+
+    def _job_info_requests(self, job_info):
+        """(RunnableParallel, its input) for the job_info_parser calls; (None, None) when job_info has nothing to parse"""
+        branches, inputs = {}, {}
+
         # Task 1: Job Title Correction
         if "title" in job_info:
             print(f"Correcting job title: {job_info['title']}")
-            corrected_title = job_title_chain.invoke({
+            branches["title"] = itemgetter("title") | self.chains["job_info"]
+            inputs["title"] = {
                 "job_info": job_info["title"],
                 "options": ""  # Not used in job title correction
-            })
-            job_info["title"] = corrected_title.strip()
-            print(f"Corrected title: {job_info['title']}")
+            }
 
         # Task 2: Document Selection
         if "detailed_page" in job_info:
             print(f"Selecting documents for job description...")
-            details: dict = job_info["detailed_page"]
-            intros = [key for key in details.keys() if key.startswith("intro")]
-            description = set(details.keys()) - set(intros)
-            
-            job_intro = "\n".join(list(details.values()))
-            if len(description):
-                job_intro = "\n".join([details[desc] for desc in description]) # for less token input, description contains words with desciptive titles, while intro most of time indicating company history, values etc. less useful info.
-            
-            selected_document = document_selection_chain.invoke({
-                "job_info": job_intro,
+            branches["selected_document_index"] = itemgetter("selected_document_index") | self.chains["document_selection"]
+            inputs["selected_document_index"] = {
+                "job_info": self._job_description(job_info),
                 "options": strings.available_documents
-            })
-            job_info["selected_document_index"] = selected_document.strip()
+            }
+
+        if not branches:
+            return None, None
+        return RunnableParallel(branches), inputs
+
+    @staticmethod
+    def _store_job_info(job_info, outputs: dict) -> None:
+        for key, output in outputs.items():
+            job_info[key] = output.strip()
+        if "title" in outputs:
+            print(f"Corrected title: {job_info['title']}")
+        if "selected_document_index" in outputs:
             print(f"Selected document index is: {job_info['selected_document_index']}")
 
-        return job_info
+    def _job_description(self, job_info) -> str:
+        """detailed_page compacted to the token budget, ranked so requirements/responsibilities outlive company intros"""
+        text, stats = self.description_compactor.compact(job_info["detailed_page"])
+        job_info["description_tokens"] = stats
+        return text
 
     def _decide_apply_strategy(self, job_info) -> bool:
         """
         Decide whether to apply for the job based on the job information. LLM should return a str of int value from 1 to 10,
         and now decide when int large than 6, we will apply for the job, otherwise skip.
+        Scores are cached by job content (score_cache), so a job seen again is not sent to the LLM.
         """
-        apply_decision_chain = self._create_chain(strings.apply_decision_template)
-        decision = apply_decision_chain.invoke({
-            "job_title": job_info["title"],
-            "job_description": job_info["detailed_page"],
-            "company_black_list": ", ".join(COMPANY_BLACKLIST),
-            "job_title_black_list": ", ".join(JOB_TITLE_BLACKLIST)
-        })
-        
-        score = int(decision.strip())
+        decision = self.score_cache.get(job_info)
+        if decision is not None:
+            print(f"Score cache hit ({self.score_cache.hits} hits / {self.score_cache.misses} misses)")
+            score = int(decision)
+        else:
+            apply_decision_chain = self.chains["apply_decision_template"]
+            decision = apply_decision_chain.invoke({
+                "job_title": job_info["title"],
+                "job_description": self._job_description(job_info),
+                "company_black_list": ", ".join(COMPANY_BLACKLIST),
+                "job_title_black_list": ", ".join(JOB_TITLE_BLACKLIST)
+            })
+            score = int(decision.strip())
+            self.score_cache.put(job_info, decision.strip())
+
         print(f"Apply decision score: {score}")
         job_info['apply_decision_score'] = decision.strip()
         job_info['apply_decision'] = score >= THRESHOLD
@@ -1,3 +1,4 @@
+import hashlib
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 import yaml
@@ -82,6 +83,8 @@ class SimplifiedJobApplicationProfile:
     work_preferences: WorkPreferences
 
     def __init__(self, yaml_str: str):
+        # Identifies this profile version, answers cached from another version are discarded
+        self.source_hash = hashlib.sha256(yaml_str.encode("utf-8")).hexdigest()
         try:
             data = yaml.safe_load(yaml_str)
         except yaml.YAMLError as e:
@@ -579,3 +579,40 @@ func_summarize_prompt_template = """
         {text_with_placeholders}
         
         ## Text without placeholders:"""
+
+# Single-call alternative to routing a question to a section and then answering from it
+fused_profile_answer_template = """
+Answer the following job application question as the candidate, using the candidate profile below.
+
+## Rules
+- First decide which profile section is relevant, it must be one of: {sections}.
+- If the question lists options labelled A, B, C..., answer with the option letter only. If the question allows several options, return all that apply separated by comma. If no option matches exactly, select the closest one.
+- Otherwise answer briefly in the first person, using only facts from the profile.
+- Respond with a single JSON object and nothing else: {{"section": "<section name>", "answer": "<answer>"}}
+
+## Example
+Question: {{'Question': 'How many years experience do you have in a development role?', 'options': {{'A': 'Not Experienced', 'B': '1 year', 'C': '2 years'}}}}
+{{"section": "develop_role", "answer": "C"}}
+
+## Candidate profile
+{profile}
+
+Question: {question}
+"""
+
+# Whole role-requirement form in one call, one answer per question id
+batch_profile_answer_template = """
+Answer every question of the following job application form as the candidate, using the candidate profile below.
+
+## Rules
+- The profile sections are: {sections}.
+- Every question lists options labelled A, B, C... Answer with the option letter only. If no option matches exactly, select the closest one.
+- For questions with "multi_select": true, return all letters that apply separated by comma.
+- Respond with a single JSON object mapping every question id to its answer and nothing else, e.g. {{"q1": "B", "q2": "A,C"}}
+
+## Candidate profile
+{profile}
+
+## Questions
+{questions}
+"""